@@ -1,35 +1,63 @@
-from passlib.context import CryptContext
 from datetime import datetime, timedelta
 from jose import jwt
 import os
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.core.password_hashing import (
+    pwd_context,
+    hash_password,
+    verify_password,
+    hash_password_async,
+    verify_and_update_password_async
+)
 
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES"))
 
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
-
 def create_access_token(data: dict):
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+from dataclasses import dataclass
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db, get_async_db
+from app.models.user import User
+from app.utils.ttl_cache import TTLCache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
-def get_current_user(token: str = Depends(oauth2_scheme), db=Depends(lambda: None)):
-    from app.database import get_db
-    from app.models.user import User
+# Authenticated user lookups, keyed by user id
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", "10000"))
+
+user_cache = TTLCache(ttl_seconds=USER_CACHE_TTL_SECONDS, max_entries=USER_CACHE_MAX_ENTRIES)
+
+
+@dataclass(frozen=True)
+class CurrentUser:
+    # Detached snapshot of a User row; safe to share across requests
+    id: int
+    email: str
+    full_name: str | None = None
 
+
+def invalidate_cached_user(user_id: int):
+    """
+    Call after changing a user's id/email/full_name or removing the user.
+    No route does that today, so the TTL is what bounds staleness (e.g. a
+    user deleted directly in the database authenticates for up to
+    USER_CACHE_TTL_SECONDS more).
+    """
+
+    user_cache.invalidate(user_id)
+
+
+def _user_id_from_token(token: str) -> int:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id: str = payload.get("sub")
@@ -38,14 +66,16 @@ def get_current_user(token: str = Depends(oauth2_scheme), db=Depends(lambda: Non
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid token"
             )
+        return int(user_id)
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token"
         )
 
-    db = next(get_db())
-    user = db.query(User).filter(User.id == int(user_id)).first()
+
+def _load_current_user(db: Session, user_id: int) -> CurrentUser:
+    user = db.query(User).filter(User.id == user_id).first()
 
     if user is None:
         raise HTTPException(
@@ -53,4 +83,33 @@ def get_current_user(token: str = Depends(oauth2_scheme), db=Depends(lambda: Non
             detail="User not found"
         )
 
-    return user
+    current_user = CurrentUser(id=user.id, email=user.email, full_name=user.full_name)
+    user_cache.set(user_id, current_user)
+
+    return current_user
+
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    user_id = _user_id_from_token(token)
+
+    cached = user_cache.get(user_id)
+    if cached is not None:
+        return cached
+
+    return _load_current_user(db, user_id)
+
+
+async def get_current_user_async(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
+    # For async routes: shares the request's AsyncSession (FastAPI resolves
+    # get_async_db once per request), so auth takes no sync-pool connection
+    user_id = _user_id_from_token(token)
+
+    cached = user_cache.get(user_id)
+    if cached is not None:
+        return cached
+
+    try:
+        return await db.run_sync(_load_current_user, user_id)
+    finally:
+        # Hand the connection back before the route starts waiting on the LLM
+        await db.commit()
@@ -3,6 +3,8 @@ from sqlalchemy.orm import sessionmaker, declarative_base
 from dotenv import load_dotenv
 import os
 
+from app.utils.metrics import instrument_engine
+
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 ENV_PATH = os.path.join(BASE_DIR, ".env")
@@ -13,7 +15,52 @@ load_dotenv(dotenv_path=ENV_PATH)
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-engine = create_engine(DATABASE_URL)
+# ---- Connection pool (shared by the sync and async engines) ----
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "1") == "1"
+
+# Async driver for the same database, e.g. postgresql+asyncpg://...
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def _async_url(url: str | None) -> str | None:
+    if not url or "://" not in url:
+        return url
+    scheme, rest = url.split("://", 1)
+    return f"{_ASYNC_DRIVERS.get(scheme, scheme)}://{rest}"
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or _async_url(DATABASE_URL)
+
+
+def _engine_options(url: str | None) -> dict:
+    options = {
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "pool_recycle": DB_POOL_RECYCLE,
+    }
+
+    # SQLite's default pools don't take sizing arguments
+    if url and not url.startswith("sqlite"):
+        options.update(
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT
+        )
+
+    return options
+
+
+engine = create_engine(DATABASE_URL, **_engine_options(DATABASE_URL))
+instrument_engine(engine)
 
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -29,3 +76,62 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# ---- Async engine, created on first use so the driver is only needed then ----
+_async_engine = None
+_async_session_factory = None
+
+
+def get_async_session_factory():
+    global _async_engine, _async_session_factory
+
+    if _async_session_factory is None:
+        from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+        _async_engine = create_async_engine(ASYNC_DATABASE_URL, **_engine_options(ASYNC_DATABASE_URL))
+        instrument_engine(_async_engine.sync_engine)
+        _async_session_factory = sessionmaker(
+            bind=_async_engine,
+            class_=AsyncSession,
+            autocommit=False,
+            autoflush=False,
+            # Attributes stay readable after commit without an implicit reload
+            expire_on_commit=False
+        )
+
+    return _async_session_factory
+
+
+async def get_async_db():
+    async with get_async_session_factory()() as db:
+        yield db
+
+
+async def dispose_async_engine():
+    global _async_engine, _async_session_factory
+
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _async_session_factory = None
+
+def init_db():
+    # Import every model so Base.metadata knows all tables
+    from app.models import (
+        user,
+        resume,
+        resume_chunk,
+        resume_retrieval,
+        interview_session,
+        interview_turn,
+        pending_question,
+        interview_feedback,
+        answer_evaluation,
+        question_bank
+    )
+
+    Base.metadata.create_all(bind=engine)
+
+    # Changes to tables that already existed
+    from app.migrations import apply_migrations
+    apply_migrations(engine)
@@ -1,12 +1,7 @@
+import os
 from fastapi import FastAPI
-from app.database import Base, engine
-from app.models import (
-    user,
-    resume,
-    resume_chunk,
-    interview_session,
-    interview_turn
-)
+from fastapi.responses import JSONResponse, PlainTextResponse
+from app.database import init_db, dispose_async_engine
 from app.routes.auth import router as auth_router
 from app.routes.resume import router as resume_router
 from app.routes.search import router as search_router
@@ -14,8 +9,19 @@ from app.routes.interview import router as interview_router
 from app.routes.interview_session import router as interview_session_router
 from app.routes.feedback import router as feedback_router
 from fastapi.middleware.cors import CORSMiddleware
+from app.utils.groq_client import close_async_client
+from app.core.password_hashing import shutdown_password_executor
+from app.utils.pdf_extractor import shutdown_pdf_executor
+from app.utils import embedding
+from app.utils.metrics import MetricsMiddleware, render_metrics
+from app.utils.profiling import ProfilingMiddleware
 
+# Schema is created by `python -m scripts.init_db`; set to 1 for local dev
+DB_CREATE_ALL_ON_STARTUP = os.getenv("DB_CREATE_ALL_ON_STARTUP", "0") == "1"
 
+# "background": warm the model after boot, /ready gates traffic
+# "eager": block startup until warm; "lazy": load on first use
+EMBEDDING_WARMUP = os.getenv("EMBEDDING_WARMUP", "background")
 
 app = FastAPI()
 app.add_middleware(
@@ -28,8 +34,9 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(ProfilingMiddleware)
 
-Base.metadata.create_all(bind=engine)
 app.include_router(search_router)
 app.include_router(interview_router)
 app.include_router(interview_session_router)
@@ -37,6 +44,44 @@ app.include_router(auth_router)
 app.include_router(resume_router)
 app.include_router(feedback_router)
 
+@app.on_event("startup")
+def startup():
+    if DB_CREATE_ALL_ON_STARTUP:
+        init_db()
+
+    if EMBEDDING_WARMUP == "eager":
+        embedding.warmup()
+    elif EMBEDDING_WARMUP == "background":
+        embedding.start_background_warmup()
+
+@app.on_event("shutdown")
+async def shutdown():
+    await close_async_client()
+    await dispose_async_engine()
+    shutdown_password_executor()
+    shutdown_pdf_executor()
+
 @app.get("/")
 def root():
     return {"message": "Backend running successfully"}
+
+@app.get("/ready")
+def ready():
+    warm = embedding.is_warm() or EMBEDDING_WARMUP == "lazy"
+    error = embedding.warmup_error()
+
+    body = {
+        "ready": warm,
+        "embedding_backend": embedding.EMBEDDING_BACKEND,
+        "embedding_mode": embedding.embedding_mode(),
+        "embedding_warm": embedding.is_warm(),
+    }
+    if error is not None:
+        body["error"] = str(error)
+
+    return JSONResponse(body, status_code=200 if warm else 503)
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    # Prometheus text exposition format; per worker process
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,155 @@
+"""
+Versioned schema migrations.
+
+create_all() only creates missing tables, so every change to an existing
+table is a numbered step here. Steps inspect the live schema before acting,
+which keeps them safe on databases that create_all() built from the current
+models. Applied versions are recorded in schema_migrations.
+"""
+import logging
+
+from sqlalchemy import (
+    Column, Integer, String, DateTime, Float, LargeBinary, MetaData, Table,
+    inspect, text
+)
+from sqlalchemy.sql import func
+
+logger = logging.getLogger(__name__)
+
+_metadata = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations",
+    _metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String, nullable=False),
+    Column("applied_at", DateTime(timezone=True), server_default=func.now())
+)
+
+
+# ---------------- helpers ----------------
+def _columns(conn, table: str) -> set:
+    return {c["name"] for c in inspect(conn).get_columns(table)}
+
+
+def _indexes(conn, table: str) -> set:
+    return {i["name"] for i in inspect(conn).get_indexes(table)}
+
+
+def _add_column(conn, table: str, name: str, ddl: str):
+    if name not in _columns(conn, table):
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}"))
+
+
+def _create_index(conn, table: str, name: str, columns: list):
+    if name not in _indexes(conn, table):
+        conn.execute(text(f"CREATE INDEX {name} ON {table} ({', '.join(columns)})"))
+
+
+# ---------------- steps ----------------
+def _resume_chunk_embedding_columns(conn):
+    dialect = conn.dialect
+    _add_column(conn, "resume_chunks", "embedding_vector", LargeBinary().compile(dialect=dialect))
+    _add_column(
+        conn, "resume_chunks", "embedding_dtype",
+        f"{String().compile(dialect=dialect)} NOT NULL DEFAULT 'float32'"
+    )
+    _add_column(conn, "resume_chunks", "embedding_scale", Float().compile(dialect=dialect))
+
+    # New rows no longer write JSON
+    if dialect.name == "postgresql":
+        conn.execute(text("ALTER TABLE resume_chunks ALTER COLUMN embedding DROP NOT NULL"))
+
+
+def _resume_content_hash(conn):
+    _add_column(conn, "resumes", "content_hash", String(64).compile(dialect=conn.dialect))
+    _create_index(conn, "resumes", "ix_resumes_content_hash", ["content_hash"])
+
+
+def _interview_indexes(conn):
+    _create_index(
+        conn, "interview_turns", "ix_interview_turns_session_main",
+        ["session_id", "is_follow_up", "created_at"]
+    )
+    _create_index(conn, "interview_turns", "ix_interview_turns_parent_turn_id", ["parent_turn_id"])
+    _create_index(conn, "resume_chunks", "ix_resume_chunks_resume_id", ["resume_id"])
+
+
+def _interview_session_counters(conn):
+    added = "main_question_count" not in _columns(conn, "interview_sessions")
+    _add_column(conn, "interview_sessions", "main_question_count", "INTEGER NOT NULL DEFAULT 0")
+    _add_column(
+        conn, "interview_sessions", "status",
+        f"{String().compile(dialect=conn.dialect)} NOT NULL DEFAULT 'active'"
+    )
+
+    if added:
+        conn.execute(text("""
+            UPDATE interview_sessions SET main_question_count = (
+                SELECT COUNT(*) FROM interview_turns
+                WHERE interview_turns.session_id = interview_sessions.id
+                AND interview_turns.is_follow_up = :main
+            )
+        """), {"main": False})
+        conn.execute(text(
+            "UPDATE interview_sessions SET status = 'completed' WHERE main_question_count >= 5"
+        ))
+
+
+def _interview_session_state(conn):
+    added = "current_turn_id" not in _columns(conn, "interview_sessions")
+    _add_column(conn, "interview_sessions", "current_turn_id", "INTEGER")
+    _add_column(conn, "interview_sessions", "current_has_follow_up", "BOOLEAN NOT NULL DEFAULT FALSE")
+    _add_column(conn, "interview_sessions", "state_version", "INTEGER NOT NULL DEFAULT 0")
+
+    if added:
+        conn.execute(text("""
+            UPDATE interview_sessions SET current_turn_id = (
+                SELECT t.id FROM interview_turns t
+                WHERE t.session_id = interview_sessions.id AND t.is_follow_up = :main
+                ORDER BY t.created_at DESC, t.id DESC
+                LIMIT 1
+            )
+        """), {"main": False})
+        conn.execute(text("""
+            UPDATE interview_sessions SET current_has_follow_up = :yes
+            WHERE EXISTS (
+                SELECT 1 FROM interview_turns f
+                WHERE f.parent_turn_id = interview_sessions.current_turn_id
+            )
+        """), {"yes": True})
+
+
+MIGRATIONS = [
+    (1, "binary embedding columns on resume_chunks", _resume_chunk_embedding_columns),
+    (2, "resumes.content_hash", _resume_content_hash),
+    (3, "indexes on interview_turns and resume_chunks", _interview_indexes),
+    (4, "main_question_count and status on interview_sessions", _interview_session_counters),
+    (5, "session state machine columns on interview_sessions", _interview_session_state),
+]
+
+
+def apply_migrations(engine) -> list:
+    """
+    Applies pending steps in order, each in its own transaction.
+    Returns the versions applied.
+    """
+
+    _metadata.create_all(bind=engine)
+
+    with engine.connect() as conn:
+        done = {row.version for row in conn.execute(schema_migrations.select())}
+
+    applied = []
+    for version, description, step in MIGRATIONS:
+        if version in done:
+            continue
+
+        with engine.begin() as conn:
+            step(conn)
+            conn.execute(schema_migrations.insert().values(version=version, description=description))
+
+        applied.append(version)
+        logger.info("Applied migration %s: %s", version, description)
+
+    return applied
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, JSON
+from sqlalchemy.sql import func
+from app.database import Base
+
+class AnswerEvaluation(Base):
+    __tablename__ = "answer_evaluations"
+
+    id = Column(Integer, primary_key=True, index=True)
+    turn_id = Column(Integer, ForeignKey("interview_turns.id"), nullable=False, unique=True)
+
+    # sha256 of the answer text that was scored; a mismatch means the answer changed
+    answer_hash = Column(String(64), nullable=False)
+
+    score = Column(Float, nullable=False)
+    evaluation = Column(JSON, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
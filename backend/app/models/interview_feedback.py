@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, UniqueConstraint
+from sqlalchemy.sql import func
+from app.database import Base
+
+class InterviewFeedback(Base):
+    __tablename__ = "interview_feedback"
+    __table_args__ = (
+        UniqueConstraint("session_id", "transcript_hash", name="uq_feedback_session_transcript"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    session_id = Column(Integer, ForeignKey("interview_sessions.id"), nullable=False)
+
+    # sha256 of the answered transcript the feedback was generated from
+    transcript_hash = Column(String(64), nullable=False)
+    feedback = Column(JSON, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
-from sqlalchemy.sql import func
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean
+from sqlalchemy.sql import func, false
 from app.database import Base
 
 class InterviewSession(Base):
@@ -10,4 +10,15 @@ class InterviewSession(Base):
     resume_id = Column(Integer, nullable=False)
     interview_type = Column(String, nullable=False)
 
+    # Maintained in the same transaction that inserts each main question,
+    # so progress checks are a single-row read instead of COUNT(*) over turns
+    main_question_count = Column(Integer, nullable=False, default=0, server_default="0")
+    status = Column(String, nullable=False, default="active", server_default="active")  # active | completed
+
+    # State machine (app/utils/session_state.py): latest MAIN turn, whether it
+    # already got its follow-up, and an optimistic-concurrency version
+    current_turn_id = Column(Integer, nullable=True)
+    current_has_follow_up = Column(Boolean, nullable=False, default=False, server_default=false())
+    state_version = Column(Integer, nullable=False, default=0, server_default="0")
+
     created_at = Column(DateTime(timezone=True), server_default=func.now())
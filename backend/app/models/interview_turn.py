@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Text, ForeignKey, DateTime, Boolean
+from sqlalchemy import Column, Integer, Text, ForeignKey, DateTime, Boolean, Index
 from sqlalchemy.sql import func
 from app.database import Base
 
@@ -7,7 +7,7 @@ class InterviewTurn(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     session_id = Column(Integer, ForeignKey("interview_sessions.id"), nullable=False)
-    parent_turn_id = Column(Integer, ForeignKey("interview_turns.id"), nullable=True)
+    parent_turn_id = Column(Integer, ForeignKey("interview_turns.id"), nullable=True, index=True)
 
     question = Column(Text, nullable=False)
     answer = Column(Text, nullable=True)
@@ -15,3 +15,8 @@ class InterviewTurn(Base):
     is_follow_up = Column(Boolean, default=False)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # "Latest main question of a session" and the main/follow-up splits
+    __table_args__ = (
+        Index("ix_interview_turns_session_main", "session_id", "is_follow_up", "created_at"),
+    )
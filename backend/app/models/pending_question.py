@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, Text, ForeignKey, DateTime
+from sqlalchemy.sql import func
+from app.database import Base
+
+class PendingQuestion(Base):
+    __tablename__ = "pending_questions"
+
+    # Speculatively generated next MAIN question, promoted to an
+    # InterviewTurn when the client asks for it
+    id = Column(Integer, primary_key=True, index=True)
+    session_id = Column(Integer, ForeignKey("interview_sessions.id"), nullable=False, unique=True)
+
+    question = Column(Text, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, UniqueConstraint, Index
+from sqlalchemy.sql import func
+from app.database import Base
+
+class QuestionBankEntry(Base):
+    __tablename__ = "question_bank_entries"
+    __table_args__ = (
+        UniqueConstraint("resume_id", "interview_type", "generation", "position", name="uq_question_bank_slot"),
+        # "Next unused question for this resume and type"
+        Index("ix_question_bank_unused", "resume_id", "interview_type", "used_by_session_id"),
+    )
+
+    # One MAIN question from a batch generated for a resume and interview type;
+    # served once, then the next batch (generation) is generated
+    id = Column(Integer, primary_key=True, index=True)
+    resume_id = Column(Integer, ForeignKey("resumes.id"), nullable=False)
+    interview_type = Column(String, nullable=False)  # lower-cased
+    generation = Column(Integer, nullable=False)
+    position = Column(Integer, nullable=False)
+
+    question = Column(Text, nullable=False)
+    used_by_session_id = Column(Integer, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
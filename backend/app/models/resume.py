@@ -13,4 +13,7 @@ class Resume(Base):
 
     extracted_text = Column(Text, nullable=True)
 
+    # sha256 of the uploaded PDF bytes; identical re-uploads reuse this row
+    content_hash = Column(String(64), nullable=True, index=True)
+
     created_at = Column(DateTime(timezone=True), server_default=func.now())
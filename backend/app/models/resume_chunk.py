@@ -1,10 +1,19 @@
-from sqlalchemy import Column, Integer, Text, ForeignKey, JSON
+from sqlalchemy import Column, Integer, Text, ForeignKey, JSON, LargeBinary, String, Float
 from app.database import Base
 
 class ResumeChunk(Base):
     __tablename__ = "resume_chunks"
 
     id = Column(Integer, primary_key=True, index=True)
-    resume_id = Column(Integer, ForeignKey("resumes.id"), nullable=False)
+    resume_id = Column(Integer, ForeignKey("resumes.id"), nullable=False, index=True)
     content = Column(Text, nullable=False)
-    embedding = Column(JSON, nullable=False)
\ No newline at end of file
+
+    # Legacy JSON list; only kept for rows not yet converted by
+    # `python -m scripts.migrate_embeddings`. None is stored as SQL NULL,
+    # not the JSON literal 'null', so IS NULL checks see cleared rows.
+    embedding = Column(JSON(none_as_null=True), nullable=True)
+
+    # Raw little-endian vector bytes (see app/utils/embedding_codec.py)
+    embedding_vector = Column(LargeBinary, nullable=True)
+    embedding_dtype = Column(String, nullable=False, default="float32", server_default="float32")
+    embedding_scale = Column(Float, nullable=True)  # int8 only
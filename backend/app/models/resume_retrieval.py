@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, JSON, UniqueConstraint
+from app.database import Base
+
+class ResumeRetrieval(Base):
+    __tablename__ = "resume_retrievals"
+    __table_args__ = (
+        UniqueConstraint("resume_id", "interview_type", name="uq_resume_retrieval_type"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    resume_id = Column(Integer, ForeignKey("resumes.id"), nullable=False)
+    interview_type = Column(String, nullable=False)  # lower-cased
+
+    # Ranked top-k ResumeChunk ids for this interview type, best first
+    chunk_ids = Column(JSON, nullable=False)
+    scores = Column(JSON, nullable=False)
@@ -1,22 +1,39 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from fastapi.security import OAuth2PasswordRequestForm
+from starlette.concurrency import run_in_threadpool
 
 from app.database import get_db
 from app.models.user import User
 from app.schemas.user import UserCreate, UserLogin, UserResponse
-from app.core.security import hash_password, verify_password, create_access_token
+from app.core.security import (
+    hash_password_async,
+    verify_and_update_password_async,
+    create_access_token
+)
 
 router = APIRouter(
     prefix="/auth",
     tags=["Authentication"]
 )
 
+# Handlers are async so bcrypt waits (in its own process pool) hold no
+# threadpool thread; the short DB calls below are pushed to the threadpool
+def _get_user_by_email(db: Session, email: str):
+    return db.query(User).filter(User.email == email).first()
+
+
+def _save_new_user(db: Session, new_user: User):
+    db.add(new_user)
+    db.commit()
+    db.refresh(new_user)
+
+
 # ---------------- SIGNUP ----------------
 @router.post("/signup", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def signup(user: UserCreate, db: Session = Depends(get_db)):
+async def signup(user: UserCreate, db: Session = Depends(get_db)):
     # Check if email already exists
-    existing_user = db.query(User).filter(User.email == user.email).first()
+    existing_user = await run_in_threadpool(_get_user_by_email, db, user.email)
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -24,7 +41,7 @@ def signup(user: UserCreate, db: Session = Depends(get_db)):
         )
 
     # Hash password
-    hashed_pw = hash_password(user.password)
+    hashed_pw = await hash_password_async(user.password)
 
     # Create user object
     new_user = User(
@@ -34,20 +51,18 @@ def signup(user: UserCreate, db: Session = Depends(get_db)):
     )
 
     # Save to DB
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await run_in_threadpool(_save_new_user, db, new_user)
 
     return new_user
 
 # ---------------- LOGIN ----------------
 @router.post("/login")
-def login(
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
 ):
     # OAuth2 uses "username" field (we treat it as email)
-    user = db.query(User).filter(User.email == form_data.username).first()
+    user = await run_in_threadpool(_get_user_by_email, db, form_data.username)
 
     if not user:
         raise HTTPException(
@@ -55,12 +70,19 @@ def login(
             detail="Invalid email or password"
         )
 
-    if not verify_password(form_data.password, user.hashed_password):
+    valid, new_hash = await verify_and_update_password_async(form_data.password, user.hashed_password)
+
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
         )
 
+    # Stored hash used an older bcrypt cost; upgrade it transparently
+    if new_hash:
+        user.hashed_password = new_hash
+        await run_in_threadpool(db.commit)
+
     access_token = create_access_token(
         data={"sub": str(user.id)}
     )
@@ -1,28 +1,66 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
+import hashlib
 import json
-import re
-from app.database import get_db
-from app.core.security import get_current_user
+import logging
+from app.database import get_async_db, get_async_session_factory, SessionLocal
+from app.core.security import get_current_user_async
 from app.models.interview_session import InterviewSession
 from app.models.interview_turn import InterviewTurn
-from app.utils.feedback_prompt import build_feedback_prompt
-from app.utils.groq_client import generate_with_groq
+from app.models.interview_feedback import InterviewFeedback
+from app.utils.feedback_prompt import build_feedback_prompt, build_feedback_summary_prompt
+from app.utils.llm_json import parse_json_response
+from app.utils.answer_scoring import collect_evaluations, EvaluationParseError, EVALUATION_ENABLED
+from app.utils.groq_client import agenerate_with_groq
+from app.routes.interview import discard_prefetch
+from app.utils.singleflight import AsyncSingleFlight
 
 router = APIRouter(
     prefix="/interview",
     tags=["Interview Feedback"]
 )
 
+feedback_flight = AsyncSingleFlight()
+logger = logging.getLogger(__name__)
+
 @router.post("/feedback")
-def generate_feedback(
+async def generate_feedback(
     session_id: int,
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user_async)
 ):
+    session, main_answers = await db.run_sync(_load_completed_interview, session_id, current_user.id)
+
+    qa_pairs = [
+        {"question": t.question, "answer": t.answer}
+        for t in main_answers
+    ]
+
+    transcript_hash = hash_transcript(session.interview_type, qa_pairs)
+
+    # Unchanged transcript → serve the stored evaluation
+    stored = await db.run_sync(_stored_feedback, session_id, transcript_hash)
+    if stored is not None:
+        return stored
+
+    # Concurrent requests for the same transcript share one LLM call
+    return await feedback_flight.do(
+        (session_id, transcript_hash),
+        lambda: _generate_and_store_feedback(session, main_answers, qa_pairs, transcript_hash)
+    )
+
+
+def _load_completed_interview(db: Session, session_id: int, user_id: int):
+    """
+    Returns (session, answered MAIN turns); raises unless all 5 were asked.
+    """
+
     session = db.query(InterviewSession).filter(
         InterviewSession.id == session_id,
-        InterviewSession.user_id == current_user.id
+        InterviewSession.user_id == user_id
     ).first()
 
     if not session:
@@ -38,60 +76,134 @@ def generate_feedback(
         .all()
     )
 
-    # Count MAIN questions (not follow-ups)
-    main_questions_count = (
-        db.query(InterviewTurn)
-        .filter(
-            InterviewTurn.session_id == session_id,
-            InterviewTurn.is_follow_up == False
-        )
-        .count()
-    )
-
-    if main_questions_count < 5:
+    # MAIN questions asked (not follow-ups), kept on the session row
+    if session.main_question_count < 5:
         raise HTTPException(
             status_code=400,
             detail="Interview not completed yet"
         )
 
+    # Interview is over; drop any speculative next question
+    discard_prefetch(db, session_id)
+
     # Get only MAIN questions with answers
-    main_answers = [t for t in turns if not t.is_follow_up]
+    return session, [t for t in turns if not t.is_follow_up]
 
-    qa_pairs = [
-        {"question": t.question, "answer": t.answer}
-        for t in main_answers
-    ]
 
-    prompt = build_feedback_prompt(
-        interview_type=session.interview_type,
-        qa_pairs=qa_pairs
+def hash_transcript(interview_type: str, qa_pairs: list) -> str:
+    payload = json.dumps(
+        {"interview_type": interview_type, "qa_pairs": qa_pairs},
+        sort_keys=True,
+        ensure_ascii=False
     )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
-    # Use higher token limit for feedback generation
-    ai_response = generate_with_groq(prompt, max_tokens=1500)
-    print("AI RAW RESPONSE:\n", ai_response)
 
+def _stored_feedback(db: Session, session_id: int, transcript_hash: str):
+    stored = db.query(InterviewFeedback.feedback).filter(
+        InterviewFeedback.session_id == session_id,
+        InterviewFeedback.transcript_hash == transcript_hash
+    ).first()
+
+    return stored.feedback if stored else None
+
+
+async def _generate_and_store_feedback(session, main_answers: list, qa_pairs: list, transcript_hash: str):
+    # The shared call may outlive the request that started it, so it has its own session
+    async with get_async_session_factory()() as db:
+        return await _generate_feedback(db, session, main_answers, qa_pairs, transcript_hash)
+
+
+async def _generate_feedback(db: AsyncSession, session, main_answers: list, qa_pairs: list, transcript_hash: str):
+    # The previous flight for this key may have just stored it
+    stored = await db.run_sync(_stored_feedback, session.id, transcript_hash)
+    if stored is not None:
+        return stored
+
+    if EVALUATION_ENABLED:
+        feedback = await _summarize_evaluations(session, main_answers)
+    else:
+        prompt = build_feedback_prompt(
+            interview_type=session.interview_type,
+            qa_pairs=qa_pairs
+        )
+
+        # Use higher token limit for feedback generation
+        ai_response = await agenerate_with_groq(prompt, max_tokens=1500)
+        logger.debug("AI raw response: %s", ai_response)
+
+        feedback = _parse_feedback(ai_response)
+
+    await db.run_sync(_store_feedback, session.id, transcript_hash, feedback)
+
+    return feedback
+
+
+def _store_feedback(db: Session, session_id: int, transcript_hash: str, feedback: dict):
     try:
-        # Try to extract JSON from the response
-        # First, try direct parsing
-        try:
-            feedback = json.loads(ai_response)
-        except json.JSONDecodeError:
-            # If direct parsing fails, try to extract JSON object
-            json_match = re.search(r"\{[\s\S]*\}", ai_response)
-            if not json_match:
-                raise HTTPException(
-                    status_code=500,
-                    detail="AI did not return valid JSON"
-                )
-            
-            # Try to parse the extracted JSON
-            feedback = json.loads(json_match.group())
+        db.add(InterviewFeedback(
+            session_id=session_id,
+            transcript_hash=transcript_hash,
+            feedback=feedback
+        ))
+        db.commit()
+    except IntegrityError:
+        # Another worker stored the same transcript first
+        db.rollback()
 
-    except json.JSONDecodeError as e:
+
+def _collect_evaluations(main_answers: list) -> list:
+    # Waits on background scoring jobs, so it gets a thread and a sync session
+    db = SessionLocal()
+    try:
+        return collect_evaluations(db, main_answers)
+    finally:
+        db.close()
+
+
+async def _summarize_evaluations(session, main_answers: list) -> dict:
+    # Per-answer scores were computed in the background as answers came in
+    try:
+        evaluations = await run_in_threadpool(_collect_evaluations, main_answers)
+    except ValueError as e:
         raise HTTPException(
             status_code=500,
-            detail=f"AI response could not be parsed: {str(e)}"
+            detail=f"AI answer evaluation could not be parsed: {str(e)}"
         )
 
+    overall_score = (
+        round(sum(e["score"] for e in evaluations) / len(evaluations), 1)
+        if evaluations else 0.0
+    )
+
+    prompt = build_feedback_summary_prompt(
+        interview_type=session.interview_type,
+        evaluations=evaluations,
+        overall_score=overall_score
+    )
+
+    ai_response = await agenerate_with_groq(prompt, max_tokens=600)
+    logger.debug("AI raw response: %s", ai_response)
+
+    feedback = _parse_feedback(ai_response)
+    feedback["overall_score"] = overall_score
+
     return feedback
+
+
+def _parse_feedback(ai_response: str) -> dict:
+    try:
+        feedback = parse_json_response(ai_response)
+        if not isinstance(feedback, dict):
+            raise EvaluationParseError(f"expected a JSON object, got {type(feedback).__name__}")
+        return feedback
+    except json.JSONDecodeError as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"AI response could not be parsed: {str(e)}"
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=500,
+            detail=str(e)
+        )
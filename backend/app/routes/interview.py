@@ -1,137 +1,646 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from app.utils.groq_client import generate_with_groq
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime, timedelta, timezone
+from app.utils.groq_client import generate_with_groq, agenerate_with_groq, stream_with_groq
 from app.models.interview_turn import InterviewTurn
-from app.models.interview_session import InterviewSession
+from app.models.pending_question import PendingQuestion
 from app.schemas.interview_answer import InterviewAnswerSubmit
 
-from app.database import get_db
-from app.core.security import get_current_user
-from app.utils.vector_search import search_resume_chunks
+from app.database import get_async_db, get_async_session_factory, SessionLocal
+from app.core.security import get_current_user_async
+from app.utils.retrieval import get_interview_chunks
+from app.utils.vector_search import embed_query
 from app.utils.prompt_builder import build_interview_prompt, build_followup_prompt
+from app.utils.sse import sse_event
+from app.utils.answer_scoring import schedule_answer_evaluation
+from app.utils.prefetch import question_prefetcher, PREFETCH_ENABLED, PREFETCH_TTL_SECONDS
+from app.utils.question_bank import (
+    QUESTION_BANK_ENABLED,
+    has_unused_question,
+    claim_bank_question,
+    schedule_bank_refill
+)
+from app.utils.session_state import (
+    SessionState,
+    load_session_state,
+    transition,
+    remember_session_state,
+    forget_session_state
+)
 
 router = APIRouter(
     prefix="/interview",
     tags=["Interview Bot"]
 )
 
-@router.post("/question")
-def generate_interview_question(
-    session_id: int,
-    interview_type: str,
-    resume_id: int,
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
-):
-    # Count main questions
-    main_questions_count = (
-        db.query(InterviewTurn)
-        .filter(
-            InterviewTurn.session_id == session_id,
-            InterviewTurn.is_follow_up == False
-        )
-        .count()
-    )
+# Each request below does at most one read transaction (skipped when the
+# session state is cached) and one write transaction, and holds no DB
+# connection while waiting on the LLM.
+
+INTERVIEW_COMPLETED = {
+    "message": "Interview completed",
+    "total_main_questions": 5
+}
 
-    if main_questions_count >= 5:
-        return {
-            "message": "Interview completed",
-            "total_main_questions": 5
-        }
 
-    # RAG retrieval
-    resume_chunks = search_resume_chunks(
+def _build_question_prompt(db: Session, interview_type: str, resume_id: int) -> str:
+    # RAG retrieval (precomputed at upload for known interview types)
+    resume_chunks = get_interview_chunks(
         db=db,
         resume_id=resume_id,
-        query=interview_type,
+        interview_type=interview_type,
         top_k=3
     )
 
-    prompt = build_interview_prompt(
+    return build_interview_prompt(
         interview_type=interview_type,
         resume_chunks=resume_chunks
     )
 
-    question = generate_with_groq(prompt)
 
-    # Store MAIN question
-    turn = InterviewTurn(
-        session_id=session_id,
-        question=question,
-        is_follow_up=False
+def _write_with_retry(db: Session, state: SessionState, write):
+    """
+    Runs write(db, state) -> new state or None (version conflict) and commits.
+    On a conflict the state is reloaded from the DB and the write retried once.
+    """
+
+    for _ in range(2):
+        new_state = write(db, state)
+
+        if new_state is not None:
+            db.commit()
+            remember_session_state(new_state)
+            return new_state
+
+        db.rollback()
+        forget_session_state(state.session_id)
+        state = load_session_state(db, state.session_id, use_cache=False)
+
+        if state is None:
+            return None
+
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Interview session changed concurrently; retry"
     )
-    db.add(turn)
+
+
+# ---------------- NEXT-QUESTION PREFETCH ----------------
+def _prefetch_next_question(session_id: int, cancelled):
+    db = SessionLocal()
+    try:
+        # Sweep questions left behind by abandoned sessions
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=PREFETCH_TTL_SECONDS)
+        db.query(PendingQuestion).filter(
+            PendingQuestion.created_at < cutoff
+        ).delete(synchronize_session=False)
+        db.commit()
+
+        already_prefetched = db.query(PendingQuestion.id).filter(
+            PendingQuestion.session_id == session_id
+        ).first()
+
+        state = load_session_state(db, session_id)
+
+        if already_prefetched or state is None or state.completed:
+            return
+
+        prompt = _build_question_prompt(db, state.interview_type, state.resume_id)
+        db.commit()  # don't hold a connection across the LLM call
+
+        question = generate_with_groq(prompt)
+
+        if cancelled.is_set():
+            return
+
+        db.add(PendingQuestion(session_id=session_id, question=question))
+        db.commit()
+    except IntegrityError:
+        # Another worker already prefetched for this session
+        db.rollback()
+    finally:
+        db.close()
+
+
+def _schedule_prefetch(state: SessionState):
+    # The job does its own DB work, off the request path.
+    # With a question bank the next question is already waiting.
+    if not PREFETCH_ENABLED or QUESTION_BANK_ENABLED or state.main_question_count >= 5:
+        return
+
+    question_prefetcher.schedule(
+        state.session_id,
+        lambda cancelled: _prefetch_next_question(state.session_id, cancelled)
+    )
+
+
+def _usable_prefetch(pending: PendingQuestion | None) -> bool:
+    if pending is None:
+        return False
+
+    created_at = pending.created_at
+    if created_at is not None and created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+
+    return created_at is None or (datetime.now(timezone.utc) - created_at).total_seconds() <= PREFETCH_TTL_SECONDS
+
+
+def discard_prefetch(db: Session, session_id: int):
+    question_prefetcher.cancel(session_id)
+
+    db.query(PendingQuestion).filter(
+        PendingQuestion.session_id == session_id
+    ).delete(synchronize_session=False)
     db.commit()
 
-    return {
-        "question": question,
-        "main_question_number": main_questions_count + 1
-    }
-@router.post("/answer")
-def submit_answer(
-    answer_data: InterviewAnswerSubmit,
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+
+# ---------------- MAIN QUESTIONS ----------------
+def _load_question_context(db: Session, session_id: int, interview_type: str, resume_id: int, use_bank: bool):
+    """
+    The read transaction for a MAIN question.
+    Returns (state, prefetched PendingQuestion or None, prompt or None);
+    no prompt and no usable prefetch means the question bank has one.
+    """
+
+    state = load_session_state(db, session_id)
+
+    if state is None or state.completed:
+        db.commit()
+        return state, None, None
+
+    pending = db.query(PendingQuestion).filter(
+        PendingQuestion.session_id == session_id
+    ).first()
+
+    prompt = None
+    banked = (
+        use_bank
+        and not _usable_prefetch(pending)
+        and has_unused_question(db, state.resume_id, state.interview_type)
+    )
+
+    if not _usable_prefetch(pending) and not banked:
+        if use_bank:
+            # Bank exhausted: generate live now, refill for later questions
+            schedule_bank_refill(state.resume_id, state.interview_type)
+        prompt = _build_question_prompt(db, interview_type, resume_id)
+
+    db.commit()
+    return state, pending, prompt
+
+
+def _store_main_question(
+    db: Session,
+    state: SessionState,
+    question: str | None,
+    pending_id: int | None = None,
+    prefetched: bool = False
 ):
-    # Get last main question (that has no follow-up yet)
-    last_main_question = (
-        db.query(InterviewTurn)
-        .filter(
-            InterviewTurn.session_id == answer_data.session_id,
-            InterviewTurn.is_follow_up == False
+    """
+    The write transaction for a MAIN question: consumes the prefetched row
+    (or, with question=None, the next question bank entry), stores the turn
+    and advances the session. Returns the new state, or None if the
+    interview is over or gone, or the prefetched row / bank entry was
+    claimed by a concurrent request.
+    """
+
+    asked = []
+    bank_empty = []
+
+    def write(db: Session, state: SessionState):
+        asked.clear()
+        bank_empty.clear()
+        if state.completed:
+            return state
+
+        text = question
+        if text is None:
+            text, empty = claim_bank_question(db, state.resume_id, state.interview_type, state.session_id)
+            if empty:
+                bank_empty.append(True)
+            if text is None:
+                return state
+
+        if pending_id is not None:
+            deleted = db.query(PendingQuestion).filter(
+                PendingQuestion.id == pending_id
+            ).delete(synchronize_session=False)
+
+            # Deleting the prefetched row is the claim on its question
+            if prefetched and not deleted:
+                return state
+
+        turn = InterviewTurn(
+            session_id=state.session_id,
+            question=text,
+            is_follow_up=False
+        )
+        db.add(turn)
+        db.flush()
+        asked.append(turn.id)
+
+        count = state.main_question_count + 1
+        return transition(
+            db,
+            state,
+            main_question_count=count,
+            status="completed" if count >= 5 else "active",
+            current_turn_id=turn.id,
+            current_question=text,
+            has_follow_up=False
         )
-        .order_by(InterviewTurn.created_at.desc())
-        .first()
+
+    new_state = _write_with_retry(db, state, write)
+
+    if bank_empty:
+        schedule_bank_refill(state.resume_id, state.interview_type)
+
+    # Another request may have asked the 5th question (or this one) first
+    if new_state is None or not asked or new_state.current_turn_id != asked[0]:
+        return None
+
+    return new_state
+
+
+async def _prepare_main_question(
+    db: AsyncSession,
+    session_id: int,
+    interview_type: str,
+    resume_id: int,
+    use_bank: bool = QUESTION_BANK_ENABLED
+):
+    """
+    Returns (state, question or None, pending_id, prompt). At most one of
+    question / prompt is set; neither means "serve from the question bank"
+    (or that the interview is over).
+    """
+
+    # Let an in-flight prefetch in this worker finish rather than duplicating it
+    if not await question_prefetcher.wait_async(session_id):
+        question_prefetcher.cancel(session_id)
+
+    # run_sync runs on the event loop thread. Retrieval may fall back to a
+    # similarity search; embed its query in the threadpool first so the
+    # search below hits embed_query's cache instead of running the model.
+    await run_in_threadpool(embed_query, interview_type)
+
+    state, pending, prompt = await db.run_sync(
+        _load_question_context, session_id, interview_type, resume_id, use_bank
     )
 
-    if not last_main_question:
-        return {"error": "No main question found"}
+    if state is None or state.completed:
+        if state is not None:
+            await db.run_sync(discard_prefetch, session_id)
+        return state, None, None, None
 
-    # Save answer
-    last_main_question.answer = answer_data.answer
-    db.commit()
+    if prompt is None:
+        if _usable_prefetch(pending):
+            return state, pending.question, pending.id, None
+        return state, None, pending.id if pending else None, None
+
+    # A stale prefetched row is removed by the write below
+    return state, None, pending.id if pending else None, prompt
+
+
+async def _next_main_question(db: AsyncSession, session_id: int, interview_type: str, resume_id: int):
+    """
+    Returns (state, stored_state, pending_id, prompt). stored_state is set
+    when a prefetched or question bank entry was already stored as the turn;
+    otherwise prompt (generate live) is set unless the interview is over.
+    """
+
+    use_bank = QUESTION_BANK_ENABLED
 
-    # Check if follow-up already exists for this main question
-    follow_up_exists = (
-        db.query(InterviewTurn)
-        .filter(
-            InterviewTurn.session_id == answer_data.session_id,
-            InterviewTurn.is_follow_up == True,
-            InterviewTurn.parent_turn_id == last_main_question.id
+    for _ in range(3):
+        state, question, pending_id, prompt = await _prepare_main_question(
+            db, session_id, interview_type, resume_id, use_bank=use_bank
         )
-        .first()
+
+        if state is None or state.completed or prompt is not None:
+            return state, None, pending_id, prompt
+
+        # Prefetched or banked: claimed and stored in one write, no LLM call
+        stored_state = await db.run_sync(
+            _store_main_question, state, question, pending_id, question is not None
+        )
+        if stored_state is not None:
+            return state, stored_state, None, None
+
+        # A concurrent request took it (or finished the interview): look again,
+        # generating live rather than racing for the bank
+        use_bank = False
+
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Interview session changed concurrently; retry"
     )
 
-    if follow_up_exists:
-        return {"message": "Follow-up already asked"}
 
-    # Get interview type from session
-    session = db.query(InterviewSession).filter(
-        InterviewSession.id == answer_data.session_id
-    ).first()
-    
-    if not session:
-        return {"error": "Session not found"}
+# ---------------- ANSWERS AND FOLLOW-UPS ----------------
+def _store_answer(db: Session, state: SessionState, answer: str, followup_question: str | None = None):
+    """
+    The write transaction for an answer: saves it on the current MAIN turn
+    and, if given, stores the follow-up. Returns (stored, retry_state):
+    stored says whether the follow-up was stored; retry_state is the fresh
+    state when the session moved to another turn that still needs a
+    follow-up, which must then be generated for its question instead.
+    """
+
+    # The follow-up was generated for this turn
+    asked_for = state.current_turn_id
+    answered = []
+    asked = []
+
+    def write(db: Session, state: SessionState):
+        answered.clear()
+        asked.clear()
+
+        # After a conflict reload this is the turn actually open
+        turn_id = state.current_turn_id
+        if turn_id is None:
+            return state
+
+        db.query(InterviewTurn).filter(
+            InterviewTurn.id == turn_id
+        ).update({InterviewTurn.answer: answer}, synchronize_session=False)
+        answered.append(turn_id)
 
+        # Moved on or already followed up: keep just the answer. The version
+        # bump still makes the write fail (and retry) if `state` was stale.
+        if followup_question is None or turn_id != asked_for or state.has_follow_up:
+            return transition(db, state)
+
+        db.add(InterviewTurn(
+            session_id=state.session_id,
+            question=followup_question,
+            is_follow_up=True,
+            parent_turn_id=turn_id
+        ))
+        asked.append(turn_id)
+        return transition(db, state, has_follow_up=True)
+
+    new_state = _write_with_retry(db, state, write)
+
+    # Score this answer now that it is committed
+    if answered:
+        schedule_answer_evaluation(answered[0])
+
+    retry_state = None
+    if (
+        followup_question is not None
+        and not asked
+        and new_state is not None
+        and new_state.current_turn_id != asked_for
+        and not new_state.has_follow_up
+    ):
+        retry_state = new_state
+
+    return bool(asked), retry_state
+
+
+def _followup_prompt(state: SessionState, answer: str) -> str:
     # Generate ONE follow-up with context
-    followup_prompt = build_followup_prompt(
-        interview_type=session.interview_type,
-        main_question=last_main_question.question,
-        candidate_answer=answer_data.answer
+    return build_followup_prompt(
+        interview_type=state.interview_type,
+        main_question=state.current_question,
+        candidate_answer=answer
     )
 
-    followup_question = generate_with_groq(followup_prompt)
 
-    followup_turn = InterviewTurn(
-        session_id=answer_data.session_id,
-        question=followup_question,
-        is_follow_up=True,
-        parent_turn_id=last_main_question.id
-    )
+def _prepare_followup(db: Session, answer_data: InterviewAnswerSubmit):
+    """
+    Returns (early_response, followup_context). Exactly one of the two is set.
+    The answer itself is saved together with the follow-up, or right here
+    when no follow-up will be asked.
+    """
 
-    db.add(followup_turn)
+    # Not from the cache: whether to ask a follow-up, and about which
+    # question, must not come from another worker's stale copy
+    state = load_session_state(db, answer_data.session_id, use_cache=False)
     db.commit()
 
+    if state is None:
+        return {"error": "Session not found"}, None
+
+    # Get last main question (that has no follow-up yet)
+    if state.current_turn_id is None:
+        return {"error": "No main question found"}, None
+
+    # Start generating the next main question while the follow-up is produced
+    _schedule_prefetch(state)
+
+    if state.has_follow_up:
+        _store_answer(db, state, answer_data.answer)
+        return {"message": "Follow-up already asked"}, None
+
+    return None, {
+        "prompt": _followup_prompt(state, answer_data.answer),
+        "state": state
+    }
+
+
+async def _store_followup(run, state: SessionState, answer: str, followup_question: str):
+    """
+    Stores the answer and follow-up through run(fn, *args) (run_sync on some
+    AsyncSession). If the session moved to another turn meanwhile, the
+    follow-up is regenerated once for that turn's question. Returns the
+    stored follow-up, or None if none was stored.
+    """
+
+    for attempt in range(2):
+        stored, retry_state = await run(_store_answer, state, answer, followup_question)
+
+        if stored:
+            return followup_question
+        if retry_state is None or attempt:
+            return None
+
+        state = retry_state
+        followup_question = await agenerate_with_groq(_followup_prompt(state, answer))
+
+
+# ---------------- STREAMING ----------------
+async def _store_with_own_session(write, *args):
+    # Streaming responses outlive the request-scoped session
+    async with get_async_session_factory()() as db:
+        return await db.run_sync(write, *args)
+
+
+async def _stream_question(prompt: str, on_complete, on_error=None):
+    """
+    Streams LLM tokens as SSE "token" events, then persists the full text
+    and emits a final "done" event with the payload returned by on_complete.
+    """
+
+    parts = []
+    try:
+        async for delta in stream_with_groq(prompt):
+            parts.append(delta)
+            yield sse_event("token", {"text": delta})
+    except Exception as e:
+        if on_error is not None:
+            await on_error()
+        yield sse_event("error", {"detail": f"Question generation failed: {str(e)}"})
+        return
+
+    question = "".join(parts).strip()
+    payload = await on_complete(question)
+    yield sse_event("done", payload)
+
+
+def _sse_response(events) -> StreamingResponse:
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def _single_event(event: str, data: dict):
+    yield sse_event(event, data)
+
+
+async def _prefetched_events(question: str, on_complete):
+    yield sse_event("token", {"text": question})
+    payload = await on_complete(question)
+    yield sse_event("done", payload)
+
+
+# Routes are async: DB work runs through AsyncSession.run_sync on the async
+# driver and LLM calls use the async client, so neither holds a thread.
+@router.post("/question")
+async def generate_interview_question(
+    session_id: int,
+    interview_type: str,
+    resume_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user_async)
+):
+    state, stored_state, pending_id, prompt = await _next_main_question(
+        db, session_id, interview_type, resume_id
+    )
+
+    if state is None or state.completed:
+        return INTERVIEW_COMPLETED
+
+    if stored_state is not None:
+        return {
+            "question": stored_state.current_question,
+            "main_question_number": stored_state.main_question_count
+        }
+
+    question = await agenerate_with_groq(prompt)
+
+    # Store MAIN question
+    new_state = await db.run_sync(_store_main_question, state, question, pending_id)
+
+    if new_state is None:
+        return INTERVIEW_COMPLETED
+
+    return {
+        "question": question,
+        "main_question_number": new_state.main_question_count
+    }
+
+
+@router.post("/question/stream")
+async def stream_interview_question(
+    session_id: int,
+    interview_type: str,
+    resume_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user_async)
+):
+    state, stored_state, pending_id, prompt = await _next_main_question(
+        db, session_id, interview_type, resume_id
+    )
+
+    if state is None or state.completed:
+        return _sse_response(_single_event("done", INTERVIEW_COMPLETED))
+
+    if stored_state is not None:
+        async def already_stored(question: str) -> dict:
+            return {
+                "question": question,
+                "main_question_number": stored_state.main_question_count
+            }
+
+        return _sse_response(_prefetched_events(stored_state.current_question, already_stored))
+
+    async def on_complete(question: str) -> dict:
+        # Store MAIN question
+        new_state = await _store_with_own_session(_store_main_question, state, question, pending_id)
+
+        if new_state is None:
+            return INTERVIEW_COMPLETED
+
+        return {
+            "question": question,
+            "main_question_number": new_state.main_question_count
+        }
+
+    return _sse_response(_stream_question(prompt, on_complete))
+
+
+@router.post("/answer")
+async def submit_answer(
+    answer_data: InterviewAnswerSubmit,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user_async)
+):
+    early_response, followup = await db.run_sync(_prepare_followup, answer_data)
+
+    if early_response is not None:
+        return early_response
+
+    try:
+        followup_question = await agenerate_with_groq(followup["prompt"])
+    except Exception:
+        # Don't lose the answer because the follow-up failed
+        await db.run_sync(_store_answer, followup["state"], answer_data.answer)
+        raise
+
+    followup_question = await _store_followup(
+        db.run_sync, followup["state"], answer_data.answer, followup_question
+    )
+
+    if followup_question is None:
+        return {"message": "Follow-up already asked"}
+
     return {
         "follow_up_question": followup_question
     }
+
+
+@router.post("/answer/stream")
+async def stream_answer_followup(
+    answer_data: InterviewAnswerSubmit,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user_async)
+):
+    early_response, followup = await db.run_sync(_prepare_followup, answer_data)
+
+    if early_response is not None:
+        return _sse_response(_single_event("done", early_response))
+
+    async def on_complete(followup_question: str) -> dict:
+        # A regenerated follow-up (the session moved on) is only in this payload
+        followup_question = await _store_followup(
+            _store_with_own_session, followup["state"], answer_data.answer, followup_question
+        )
+
+        if followup_question is None:
+            return {"message": "Follow-up already asked"}
+
+        return {
+            "follow_up_question": followup_question
+        }
+
+    async def on_error():
+        await _store_with_own_session(_store_answer, followup["state"], answer_data.answer)
+
+    return _sse_response(_stream_question(followup["prompt"], on_complete, on_error))
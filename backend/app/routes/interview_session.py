@@ -5,6 +5,8 @@ from app.database import get_db
 from app.core.security import get_current_user
 from app.models.interview_session import InterviewSession
 from app.schemas.interview_session import InterviewSessionStart
+from app.utils.session_state import SessionState, remember_session_state
+from app.utils.question_bank import schedule_bank_refill
 
 router = APIRouter(
     prefix="/interview-session",
@@ -29,6 +31,12 @@ def start_interview(
         db.commit()
         db.refresh(session)
 
+        # The first /interview/question then needs no read
+        remember_session_state(SessionState.from_row(session))
+
+        # Have this resume's question bank ready before the first question
+        schedule_bank_refill(session.resume_id, session.interview_type)
+
         return {
             "message": "Interview session started",
             "session_id": session.id
@@ -1,24 +1,67 @@
 import os
-import shutil
+import hashlib
+import logging
 from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, status
+from sqlalchemy import func, insert
 from sqlalchemy.orm import Session
-from app.utils.pdf_extractor import extract_text_from_pdf
-from app.utils.text_cleaner import clean_resume_text
-from app.utils.text_chunker import chunk_text
+from app.utils.pdf_extractor import PdfExtractionError, PdfTooLargeError, PDF_MAX_BYTES
+from app.utils.ingestion import ingest_pdf
 from app.models.resume_chunk import ResumeChunk
-from app.utils.embedding import embed_text
+from app.utils.embedding_codec import encode_embedding, EMBEDDING_STORAGE_DTYPE
+from app.utils.vector_cache import invalidate_resume
+from app.utils.retrieval import materialize_interview_retrievals
+from app.utils.ann_index import ANN_INDEX_ENABLED, get_ann_index
 
 from app.database import get_db
 from app.models.resume import Resume
 from app.core.security import get_current_user
 
 UPLOAD_DIR = "uploads"
+UPLOAD_READ_BYTES = 1024 * 1024
 
 router = APIRouter(
     prefix="/resume",
     tags=["Resume"]
 )
 
+logger = logging.getLogger(__name__)
+
+def _read_upload(file: UploadFile):
+    digest = hashlib.sha256()
+    content = bytearray()
+
+    while True:
+        block = file.file.read(UPLOAD_READ_BYTES)
+        if not block:
+            break
+
+        content += block
+        if len(content) > PDF_MAX_BYTES:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"PDF exceeds the {PDF_MAX_BYTES} byte limit"
+            )
+
+        digest.update(block)
+
+    return bytes(content), digest.hexdigest()
+
+
+def _find_processed_resume(db: Session, user_id: int, content_hash: str):
+    # Only rows whose chunks were fully written count as processed
+    return (
+        db.query(Resume.id, func.count(ResumeChunk.id).label("total_chunks"))
+        .join(ResumeChunk, ResumeChunk.resume_id == Resume.id)
+        .filter(
+            Resume.user_id == user_id,
+            Resume.content_hash == content_hash
+        )
+        .group_by(Resume.id)
+        .order_by(Resume.id.desc())
+        .first()
+    )
+
+
 @router.post("/upload")
 def upload_resume(
     file: UploadFile = File(...),
@@ -31,20 +74,46 @@ def upload_resume(
             detail="Only PDF files are allowed"
         )
 
+    # ---- Read the upload once: size cap, hash, keep bytes ----
+    content, content_hash = _read_upload(file)
+
+    existing = _find_processed_resume(db, current_user.id, content_hash)
+    if existing is not None:
+        return {
+            "message": "Resume already uploaded; reusing processed copy",
+            "resume_id": existing.id,
+            "total_chunks": existing.total_chunks,
+            "duplicate": True
+        }
+
     os.makedirs(UPLOAD_DIR, exist_ok=True)
 
     file_path = os.path.join(UPLOAD_DIR, f"{current_user.id}_{file.filename}")
 
     with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-    raw_text = extract_text_from_pdf(file_path)
-    cleaned_text = clean_resume_text(raw_text)
+        buffer.write(content)
+
+    # ---- Extract → clean → chunk → embed, page by page ----
+    try:
+        # The saved copy: pool workers open it by path
+        ingestion = ingest_pdf(file_path)
+    except PdfTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
+    except PdfExtractionError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
     resume = Resume(
         user_id=current_user.id,
         file_name=file.filename,
         file_path=file_path,
-        extracted_text=cleaned_text
+        extracted_text=ingestion.text,
+        content_hash=content_hash
 
     )
 
@@ -52,19 +121,49 @@ def upload_resume(
     db.commit()
     db.refresh(resume)
 
-    # ---- Chunk the cleaned resume text ----
-    chunks = chunk_text(resume.extracted_text)
-    for chunk in chunks:
-        embedding = embed_text(chunk)
+    chunks = ingestion.chunks
+    embeddings = ingestion.embeddings
+
+    # ---- Bulk insert the embedded chunks ----
+    rows = []
+    for chunk, embedding in zip(chunks, embeddings):
+        blob, scale = encode_embedding(embedding)  # numpy → raw bytes
+        rows.append({
+            "resume_id": resume.id,
+            "content": chunk,
+            "embedding_vector": blob,
+            "embedding_dtype": EMBEDDING_STORAGE_DTYPE,
+            "embedding_scale": scale
+        })
+
+    # One batched INSERT ... RETURNING (insertmanyvalues); ids come back in row order
+    chunk_ids = list(db.scalars(
+        insert(ResumeChunk).returning(ResumeChunk.id, sort_by_parameter_order=True),
+        rows
+    )) if rows else []
 
-        chunk_obj = ResumeChunk(
+    # ---- Precompute retrieval for each interview type ----
+    materialize_interview_retrievals(
+        db=db,
         resume_id=resume.id,
-        content=chunk,
-        embedding=embedding.tolist()  # convert numpy → JSON
+        chunk_ids=chunk_ids,
+        embeddings=embeddings
     )
-        db.add(chunk_obj)
-
     db.commit()
+    invalidate_resume(resume.id)
+
+    # ---- Make the chunks searchable across resumes ----
+    if ANN_INDEX_ENABLED:
+        try:
+            get_ann_index().add(
+                chunk_ids=chunk_ids,
+                resume_id=resume.id,
+                user_id=current_user.id,
+                embeddings=embeddings
+            )
+        except OSError:
+            # The upload stands; the next index rebuild picks these chunks up
+            logger.exception("ANN index update failed for resume %s", resume.id)
 
     return {
     "message": "Resume uploaded and chunked successfully",
@@ -1,9 +1,14 @@
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
-from app.database import get_db
-from app.core.security import get_current_user
-from app.utils.vector_search import search_resume_chunks
+from app.database import get_async_db
+from app.core.security import get_current_user_async
+from app.utils.vector_search import search_resume_chunks, embed_query
+from app.utils.ann_index import get_ann_index
+from app.models.resume import Resume
+from app.models.resume_chunk import ResumeChunk
 
 router = APIRouter(
     prefix="/search",
@@ -11,20 +16,72 @@ router = APIRouter(
 )
 
 @router.get("/resume")
-def search_resume(
+async def search_resume(
     query: str = Query(..., description="Search query"),
     resume_id: int = Query(...),
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user_async)
 ):
-    results = search_resume_chunks(
-        db=db,
-        resume_id=resume_id,
-        query=query,
-        top_k=3
+    # Model inference is CPU-bound; embed_query caches it for the search below
+    await run_in_threadpool(embed_query, query)
+
+    results = await db.run_sync(
+        lambda session: search_resume_chunks(
+            db=session,
+            resume_id=resume_id,
+            query=query,
+            top_k=3
+        )
     )
 
     return {
         "query": query,
         "results": results
     }
+
+
+@router.get("/resumes")
+async def search_resumes(
+    query: str = Query(..., description="Search query"),
+    top_k: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_user_async)
+):
+    # Ranks every resume the caller owns by its best-matching chunks
+    query_embedding = await run_in_threadpool(embed_query, query)
+    hits = await run_in_threadpool(
+        get_ann_index().search,
+        query_embedding,
+        top_k=top_k,
+        user_id=current_user.id
+    )
+
+    chunk_ids = [chunk_id for hit in hits for chunk_id, _ in hit["chunks"]]
+    contents = dict((await db.execute(
+        select(ResumeChunk.id, ResumeChunk.content)
+        .where(ResumeChunk.id.in_(chunk_ids))
+    )).all()) if chunk_ids else {}
+    file_names = dict((await db.execute(
+        select(Resume.id, Resume.file_name)
+        .where(Resume.id.in_([hit["resume_id"] for hit in hits]))
+    )).all()) if hits else {}
+
+    results = [
+        {
+            "resume_id": hit["resume_id"],
+            "file_name": file_names.get(hit["resume_id"]),
+            "score": hit["score"],
+            "matches": [
+                {"content": contents[chunk_id], "score": score}
+                for chunk_id, score in hit["chunks"]
+                if chunk_id in contents
+            ]
+        }
+        for hit in hits
+        if hit["resume_id"] in file_names
+    ]
+
+    return {
+        "query": query,
+        "results": results
+    }
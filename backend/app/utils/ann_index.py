@@ -0,0 +1,366 @@
+"""
+Persistent IVF (inverted file) index over every ResumeChunk embedding,
+for searching across resumes.
+
+Layout in ANN_INDEX_DIR, per generation g:
+    manifest.json               {"generation": g, "dim": d, "nlist": n}
+    g.centroids.npy             (nlist, dim) float32, unit-normalized
+    g.vectors.f16               append-only (rows, dim) float16
+    g.chunk_ids / g.resume_ids / g.user_ids / g.list_ids   append-only int columns
+
+Uploads append rows under an fcntl lock; every worker notices growth by
+file size and loads only the new tail. Retraining (scripts/build_ann_index.py)
+writes a new generation and swaps manifest.json atomically. A fresh index
+is a single list (exact search) until it is first trained.
+"""
+import fcntl
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+from app.utils.metrics import timed_stage
+
+ANN_INDEX_ENABLED = os.getenv("ANN_INDEX_ENABLED", "1") == "1"
+ANN_INDEX_DIR = os.getenv("ANN_INDEX_DIR", "ann_index")
+ANN_NPROBE = int(os.getenv("ANN_NPROBE", "16"))
+
+# A user with at most this many chunks is searched exactly, not via IVF probes
+ANN_EXACT_THRESHOLD = int(os.getenv("ANN_EXACT_THRESHOLD", "20000"))
+
+# Rows appended since the posting lists were last sorted; scanned separately
+ANN_MAX_UNSORTED = 50000
+
+# Candidate vectors converted to float32 at a time while scoring
+ANN_SCORE_BLOCK = 65536
+
+_COLUMNS = {
+    "chunk_ids": np.dtype("<i8"),
+    "resume_ids": np.dtype("<i8"),
+    "user_ids": np.dtype("<i8"),
+    "list_ids": np.dtype("<i4"),
+}
+_VECTOR_DTYPE = np.dtype("<f2")
+
+
+def _normalize(vectors) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def train_centroids(sample: np.ndarray, nlist: int, iterations: int = 15, seed: int = 0) -> np.ndarray:
+    """
+    Spherical k-means on unit vectors.
+    """
+
+    rng = np.random.default_rng(seed)
+    sample = _normalize(sample)
+    nlist = max(1, min(nlist, len(sample)))
+
+    centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+
+    for _ in range(iterations):
+        assignments = assign_lists(centroids, sample)
+
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, sample)
+        counts = np.bincount(assignments, minlength=nlist)
+
+        # Re-seed empty lists from random points
+        empty = counts == 0
+        if empty.any():
+            sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+
+        centroids = _normalize(sums)
+
+    return centroids
+
+
+def assign_lists(centroids: np.ndarray, vectors: np.ndarray, batch: int = 65536) -> np.ndarray:
+    return np.concatenate([
+        np.argmax(vectors[start:start + batch] @ centroids.T, axis=1).astype(np.int32)
+        for start in range(0, len(vectors), batch)
+    ]) if len(vectors) else np.empty(0, dtype=np.int32)
+
+
+class AnnIndex:
+    def __init__(self, directory: str = ANN_INDEX_DIR):
+        self.directory = directory
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self._manifest_version = None
+        self.generation = None
+        self.dim = None
+        self.centroids = None
+        self.count = 0
+        self.columns = {name: np.empty(0, dtype=dtype) for name, dtype in _COLUMNS.items()}
+        self.vectors = None
+        self._order = np.empty(0, dtype=np.int64)
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._sorted_count = 0
+
+    # ---------------- files ----------------
+    def _manifest_path(self) -> str:
+        return os.path.join(self.directory, "manifest.json")
+
+    def path(self, generation: int, name: str) -> str:
+        return os.path.join(self.directory, f"{generation}.{name}")
+
+    @contextmanager
+    def file_lock(self):
+        # Serializes writers across uvicorn workers and the rebuild script
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, ".lock"), "a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _row_sizes(self, dim: int) -> dict:
+        # Bytes per row in each of a generation's append-only files
+        sizes = {name: dtype.itemsize for name, dtype in _COLUMNS.items()}
+        sizes["vectors.f16"] = _VECTOR_DTYPE.itemsize * dim
+        return sizes
+
+    def _stored_rows(self, generation: int, dim: int | None = None) -> int:
+        # Rows are complete only once every file has them
+        return min(
+            os.path.getsize(self.path(generation, name)) // row_size
+            if os.path.exists(self.path(generation, name)) else 0
+            for name, row_size in self._row_sizes(dim or self.dim).items()
+        )
+
+    # ---------------- loading ----------------
+    def refresh(self):
+        """
+        Picks up retrains and rows appended by other processes.
+        """
+
+        with self._lock:
+            try:
+                stat = os.stat(self._manifest_path())
+            except FileNotFoundError:
+                return
+
+            # os.replace() gives the new manifest a new inode
+            version = (stat.st_ino, stat.st_mtime_ns)
+            if version != self._manifest_version:
+                with open(self._manifest_path()) as f:
+                    manifest = json.load(f)
+                self._reset()
+                self._manifest_version = version
+                self.generation = manifest["generation"]
+                self.dim = manifest["dim"]
+                self.centroids = np.load(self.path(self.generation, "centroids.npy"))
+
+            stored = self._stored_rows(self.generation)
+            if stored <= self.count:
+                return
+
+            for name, dtype in _COLUMNS.items():
+                tail = np.fromfile(
+                    self.path(self.generation, name),
+                    dtype=dtype,
+                    count=stored - self.count,
+                    offset=self.count * dtype.itemsize
+                )
+                self.columns[name] = np.concatenate([self.columns[name], tail])
+
+            self.count = stored
+            self.vectors = np.memmap(
+                self.path(self.generation, "vectors.f16"),
+                dtype=_VECTOR_DTYPE,
+                mode="r",
+                shape=(stored, self.dim)
+            )
+
+            if self.count - self._sorted_count > ANN_MAX_UNSORTED or self._sorted_count == 0:
+                self._sort_postings()
+
+    def _sort_postings(self):
+        list_ids = self.columns["list_ids"]
+        self._order = np.argsort(list_ids, kind="stable")
+        self._offsets = np.searchsorted(list_ids[self._order], np.arange(len(self.centroids) + 1))
+        self._sorted_count = self.count
+
+    # ---------------- writing ----------------
+    def write_generation(self, generation: int, centroids: np.ndarray):
+        os.makedirs(self.directory, exist_ok=True)
+        np.save(self.path(generation, "centroids.npy"), centroids.astype(np.float32))
+
+    def publish(self, generation: int, dim: int, nlist: int):
+        tmp = self._manifest_path() + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"generation": generation, "dim": dim, "nlist": nlist}, f)
+        os.replace(tmp, self._manifest_path())
+
+    def remove_generation(self, generation: int):
+        for name in ["centroids.npy", "vectors.f16", *_COLUMNS]:
+            try:
+                os.remove(self.path(generation, name))
+            except FileNotFoundError:
+                pass
+
+    def append(self, generation: int, centroids: np.ndarray, chunk_ids, resume_ids, user_ids, embeddings):
+        """
+        Appends rows to a generation's files. Caller holds file_lock().
+        """
+
+        vectors = _normalize(embeddings)
+        dim = vectors.shape[1]
+
+        # An append that failed part-way left some files longer than others;
+        # cut them back so new rows line up across files again
+        stored = self._stored_rows(generation, dim)
+        for name, row_size in self._row_sizes(dim).items():
+            path = self.path(generation, name)
+            if os.path.exists(path) and os.path.getsize(path) > stored * row_size:
+                os.truncate(path, stored * row_size)
+
+        columns = {
+            "chunk_ids": np.asarray(chunk_ids),
+            "resume_ids": np.asarray(resume_ids),
+            "user_ids": np.asarray(user_ids),
+            "list_ids": assign_lists(centroids, vectors),
+        }
+
+        # Vectors first: a row only counts once all of its columns exist
+        with open(self.path(generation, "vectors.f16"), "ab") as f:
+            vectors.astype(_VECTOR_DTYPE).tofile(f)
+        for name, dtype in _COLUMNS.items():
+            with open(self.path(generation, name), "ab") as f:
+                columns[name].astype(dtype).tofile(f)
+
+    def add(self, chunk_ids: list, resume_id: int, user_id: int, embeddings: np.ndarray):
+        if len(chunk_ids) == 0:
+            return
+
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+
+        with self._lock, self.file_lock():
+            self.refresh()
+
+            if self.generation is None:
+                # Untrained: one list holding everything, i.e. exact search
+                dim = embeddings.shape[1]
+                centroids = np.zeros((1, dim), dtype=np.float32)
+                self.write_generation(0, centroids)
+                self.publish(0, dim, 1)
+                self.refresh()
+
+            # A rebuild may already have picked these rows up from the database
+            chunk_ids = np.asarray(chunk_ids)
+            fresh = ~np.isin(chunk_ids, self.columns["chunk_ids"])
+            if not fresh.any():
+                return
+            chunk_ids = chunk_ids[fresh]
+            embeddings = embeddings[fresh]
+
+            self.append(
+                self.generation,
+                self.centroids,
+                chunk_ids,
+                [resume_id] * len(chunk_ids),
+                [user_id] * len(chunk_ids),
+                embeddings
+            )
+
+        self.refresh()
+
+    # ---------------- search ----------------
+    def _candidates(self, query: np.ndarray, user_id: int | None, nprobe: int) -> np.ndarray:
+        if user_id is not None:
+            owned = np.flatnonzero(self.columns["user_ids"] == user_id)
+            if len(owned) <= ANN_EXACT_THRESHOLD:
+                return owned
+
+        nprobe = min(nprobe, len(self.centroids))
+        centroid_scores = self.centroids @ query
+        probes = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+
+        parts = [self._order[self._offsets[l]:self._offsets[l + 1]] for l in probes]
+
+        # Rows appended since the last sort aren't in the posting lists yet
+        if self._sorted_count < self.count:
+            recent = np.arange(self._sorted_count, self.count)
+            parts.append(recent[np.isin(self.columns["list_ids"][recent], probes)])
+
+        candidates = np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+        if user_id is not None:
+            candidates = candidates[self.columns["user_ids"][candidates] == user_id]
+
+        return candidates
+
+    @timed_stage("vector_search")
+    def search(
+        self,
+        query: np.ndarray,
+        top_k: int = 10,
+        user_id: int | None = None,
+        nprobe: int = ANN_NPROBE,
+        chunks_per_resume: int = 3
+    ) -> list:
+        """
+        Returns up to top_k resumes ranked by their best-matching chunk:
+        [{"resume_id", "score", "chunks": [(chunk_id, score), ...]}]
+        """
+
+        self.refresh()
+
+        with self._lock:
+            if self.count == 0:
+                return []
+
+            query = _normalize(np.asarray(query).reshape(1, -1))[0]
+            candidates = self._candidates(query, user_id, nprobe)
+            if len(candidates) == 0:
+                return []
+
+            candidates = np.sort(candidates)  # sequential reads from the memmap
+
+            # In blocks: an unfiltered search of an untrained index covers every row
+            scores = np.empty(len(candidates), dtype=np.float32)
+            for start in range(0, len(candidates), ANN_SCORE_BLOCK):
+                block = candidates[start:start + ANN_SCORE_BLOCK]
+                scores[start:start + len(block)] = self.vectors[block].astype(np.float32) @ query
+            resume_ids = self.columns["resume_ids"][candidates]
+            chunk_ids = self.columns["chunk_ids"][candidates]
+
+        ranked = np.argsort(-scores)
+        ranked_resumes = resume_ids[ranked]
+
+        # Best chunk per resume is its first appearance in score order
+        unique_resumes, first_rank = np.unique(ranked_resumes, return_index=True)
+        keep = unique_resumes[np.argsort(first_rank)[:top_k]]
+
+        results = {int(resume_id): {"resume_id": int(resume_id), "chunks": []} for resume_id in keep}
+        for i in ranked[np.isin(ranked_resumes, keep)]:
+            entry = results[int(resume_ids[i])]
+            if len(entry["chunks"]) < chunks_per_resume:
+                entry["chunks"].append((int(chunk_ids[i]), float(scores[i])))
+
+        for entry in results.values():
+            entry["score"] = entry["chunks"][0][1]
+
+        return list(results.values())
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_ann_index() -> AnnIndex:
+    global _index
+
+    with _index_lock:
+        if _index is None:
+            _index = AnnIndex()
+        return _index
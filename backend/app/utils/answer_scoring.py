@@ -0,0 +1,159 @@
+import hashlib
+import logging
+import os
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models.answer_evaluation import AnswerEvaluation
+from app.models.interview_session import InterviewSession
+from app.models.interview_turn import InterviewTurn
+from app.utils.feedback_prompt import build_answer_evaluation_prompt
+from app.utils.groq_client import generate_with_groq
+from app.utils.llm_json import parse_json_response
+from app.utils.prefetch import Prefetcher
+
+EVALUATION_ENABLED = os.getenv("EVALUATION_ENABLED", "1") == "1"
+EVALUATION_WORKERS = int(os.getenv("EVALUATION_WORKERS", "4"))
+EVALUATION_MAX_TOKENS = int(os.getenv("EVALUATION_MAX_TOKENS", "300"))
+
+# Seconds the final feedback step waits for a still-running evaluation
+EVALUATION_WAIT_SECONDS = float(os.getenv("EVALUATION_WAIT_SECONDS", "20"))
+
+evaluation_jobs = Prefetcher(max_workers=EVALUATION_WORKERS)
+
+logger = logging.getLogger(__name__)
+
+
+class EvaluationParseError(ValueError):
+    # The LLM's evaluation wasn't a JSON object with a numeric score
+    pass
+
+
+def hash_answer(answer: str) -> str:
+    return hashlib.sha256(answer.encode("utf-8")).hexdigest()
+
+
+def evaluate_answer(interview_type: str, question: str, answer: str) -> dict:
+    prompt = build_answer_evaluation_prompt(
+        interview_type=interview_type,
+        question=question,
+        answer=answer
+    )
+
+    ai_response = generate_with_groq(prompt, max_tokens=EVALUATION_MAX_TOKENS)
+
+    try:
+        evaluation = parse_json_response(ai_response)
+        if not isinstance(evaluation, dict):
+            raise ValueError(f"expected a JSON object, got {type(evaluation).__name__}")
+        evaluation["score"] = min(max(float(evaluation.get("score", 0)), 0.0), 10.0)
+    except (ValueError, TypeError) as e:
+        raise EvaluationParseError(str(e))
+
+    return evaluation
+
+
+def store_evaluation(db: Session, turn_id: int, answer_hash: str, evaluation: dict):
+    existing = db.query(AnswerEvaluation).filter(
+        AnswerEvaluation.turn_id == turn_id
+    ).first()
+
+    try:
+        if existing is None:
+            db.add(AnswerEvaluation(
+                turn_id=turn_id,
+                answer_hash=answer_hash,
+                score=evaluation["score"],
+                evaluation=evaluation
+            ))
+        else:
+            existing.answer_hash = answer_hash
+            existing.score = evaluation["score"]
+            existing.evaluation = evaluation
+        db.commit()
+    except IntegrityError:
+        # Another worker scored this turn concurrently
+        db.rollback()
+
+
+def _evaluate_turn(turn_id: int, cancelled):
+    db = SessionLocal()
+    try:
+        turn = db.query(InterviewTurn).filter(InterviewTurn.id == turn_id).first()
+        if turn is None or not turn.answer:
+            return
+
+        answer_hash = hash_answer(turn.answer)
+        current = db.query(AnswerEvaluation.answer_hash).filter(
+            AnswerEvaluation.turn_id == turn_id
+        ).first()
+        if current is not None and current.answer_hash == answer_hash:
+            return
+
+        session = db.query(InterviewSession).filter(
+            InterviewSession.id == turn.session_id
+        ).first()
+
+        try:
+            evaluation = evaluate_answer(session.interview_type, turn.question, turn.answer)
+        except EvaluationParseError:
+            # Left unscored; the feedback step retries it inline
+            logger.warning("Evaluation of turn %s could not be parsed", turn_id, exc_info=True)
+            return
+
+        if not cancelled.is_set():
+            store_evaluation(db, turn_id, answer_hash, evaluation)
+    finally:
+        db.close()
+
+
+def schedule_answer_evaluation(turn_id: int):
+    if EVALUATION_ENABLED:
+        evaluation_jobs.schedule(turn_id, lambda cancelled: _evaluate_turn(turn_id, cancelled))
+
+
+def collect_evaluations(db: Session, turns: list) -> list:
+    """
+    Returns the stored evaluation for each answered MAIN turn, in order.
+    Turns whose evaluation is missing or stale are scored in parallel first.
+    """
+
+    def current_evaluations():
+        rows = db.query(AnswerEvaluation).filter(
+            AnswerEvaluation.turn_id.in_([t.id for t in turns])
+        ).all()
+        by_turn = {row.turn_id: row for row in rows}
+        return {
+            t.id: by_turn[t.id].evaluation
+            for t in turns
+            if t.id in by_turn and by_turn[t.id].answer_hash == hash_answer(t.answer)
+        }
+
+    evaluations = current_evaluations()
+    missing = [t for t in turns if t.id not in evaluations]
+
+    if missing:
+        for turn in missing:
+            evaluation_jobs.schedule(turn.id, lambda cancelled, turn_id=turn.id: _evaluate_turn(turn_id, cancelled))
+        for turn in missing:
+            evaluation_jobs.wait(turn.id, timeout=EVALUATION_WAIT_SECONDS)
+
+        db.expire_all()
+        evaluations = current_evaluations()
+
+    # Anything still missing (job failed or timed out) is scored inline
+    session = None
+    for turn in turns:
+        if turn.id in evaluations:
+            continue
+        if session is None:
+            session = db.query(InterviewSession).filter(
+                InterviewSession.id == turn.session_id
+            ).first()
+        evaluation = evaluate_answer(session.interview_type, turn.question, turn.answer)
+        store_evaluation(db, turn.id, hash_answer(turn.answer), evaluation)
+        evaluations[turn.id] = evaluation
+
+    return [evaluations[t.id] for t in turns]
@@ -1,8 +1,132 @@
-from sentence_transformers import SentenceTransformer
 import numpy as np
+import os
+import threading
 
-# Load model once (important)
-model = SentenceTransformer("all-MiniLM-L6-v2")
+from app.utils.embedding_backends import load_backend
+from app.utils.embedding_service import (
+    EMBEDDING_SERVICE_SOCKET,
+    EmbeddingServiceClient,
+    EmbeddingServiceUnavailable
+)
+from app.utils.metrics import timed_stage
+
+# Chunks per forward pass when embedding a whole resume
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "32"))
+
+# "torch" (sentence-transformers) or "onnx" (ONNX Runtime, CPU)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+# Local model directory; required for onnx, optional for torch
+EMBEDDING_MODEL_DIR = os.getenv("EMBEDDING_MODEL_DIR")
+EMBEDDING_ONNX_QUANTIZE = os.getenv("EMBEDDING_ONNX_QUANTIZE", "0") == "1"
+EMBEDDING_THREADS = int(os.getenv("EMBEDDING_THREADS", "0"))
+
+# Load model once (important) -- on first use or during warmup, not at import
+_backend = None
+_backend_lock = threading.Lock()
+_warm = threading.Event()
+_warmup_error = None
+
+# Shared sidecar (see embedding_service.py); None means always in-process
+_service = EmbeddingServiceClient(EMBEDDING_SERVICE_SOCKET) if EMBEDDING_SERVICE_SOCKET else None
+_service_tokenizer = None
+
+def get_backend():
+    global _backend
+
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = load_backend(
+                    EMBEDDING_BACKEND,
+                    model_dir=EMBEDDING_MODEL_DIR,
+                    quantize=EMBEDDING_ONNX_QUANTIZE,
+                    threads=EMBEDDING_THREADS
+                )
+
+    return _backend
+
+def _service_info():
+    # None when no sidecar is configured or it is currently unreachable
+    if _service is None or not _service.available():
+        return None
+
+    try:
+        return _service.info()
+    except EmbeddingServiceUnavailable:
+        return None
+
+@timed_stage("embedding")
+def _encode(texts: list, batch_size: int) -> np.ndarray:
+    if _service is not None and _service.available():
+        try:
+            return _service.encode(texts)
+        except EmbeddingServiceUnavailable:
+            pass
+
+    return get_backend().encode(texts, batch_size=batch_size)
+
+def embedding_mode() -> str:
+    return "service" if _service_info() is not None else "in-process"
+
+def warmup():
+    """
+    Loads the model and runs one forward pass so the first request doesn't pay for it.
+    """
+    global _warmup_error
+
+    try:
+        # With a reachable sidecar the worker never loads the model itself
+        if _service_info() is None:
+            get_backend().encode(["warm up"], batch_size=1)
+        _warm.set()
+    except Exception as e:
+        _warmup_error = e
+        raise
+
+def start_background_warmup() -> threading.Thread:
+    thread = threading.Thread(target=warmup, name="embedding-warmup", daemon=True)
+    thread.start()
+    return thread
+
+def is_warm() -> bool:
+    return _warm.is_set()
+
+def warmup_error():
+    return _warmup_error
+
+def get_tokenizer():
+    global _service_tokenizer
+
+    info = _service_info()
+    if info is None:
+        return get_backend().tokenizer
+
+    # Tokenizers are cheap to load; chunking still happens in the worker
+    if _service_tokenizer is None:
+        from transformers import AutoTokenizer
+        _service_tokenizer = AutoTokenizer.from_pretrained(info["tokenizer"])
+
+    return _service_tokenizer
+
+def max_chunk_tokens() -> int:
+    info = _service_info()
+    max_seq_length = info["max_seq_length"] if info else get_backend().max_seq_length
+
+    # The model truncates past max_seq_length, which includes [CLS] and [SEP]
+    return max_seq_length - 2
 
 def embed_text(text: str) -> np.ndarray:
-    return model.encode(text, normalize_embeddings=True)
+    return _encode([text], batch_size=1)[0]
+
+def embed_texts(texts: list, batch_size: int = EMBED_BATCH_SIZE) -> np.ndarray:
+    """
+    Embeds many texts in batched forward passes.
+    Returns a (len(texts), dim) float32 matrix of normalized vectors.
+    """
+
+    if not texts:
+        info = _service_info()
+        dimension = info["dimension"] if info else get_backend().dimension
+        return np.empty((0, dimension), dtype=np.float32)
+
+    return _encode(texts, batch_size=batch_size)
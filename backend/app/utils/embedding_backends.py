@@ -0,0 +1,148 @@
+import json
+import os
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+DEFAULT_MODEL_NAME = "all-MiniLM-L6-v2"
+DEFAULT_TOKENIZER_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+DEFAULT_MAX_SEQ_LENGTH = 256
+
+ONNX_MODEL_FILE = "model.onnx"
+ONNX_QUANTIZED_MODEL_FILE = "model_quantized.onnx"
+
+
+class EmbeddingBackend(ABC):
+    """
+    What embed_text / embed_texts need from a model: a HF-style tokenizer,
+    the sequence limit, the output dimension, and batched normalized encoding.
+    """
+
+    name = "base"
+    tokenizer = None
+    max_seq_length = DEFAULT_MAX_SEQ_LENGTH
+    dimension = 0
+
+    @abstractmethod
+    def encode(self, texts: list, batch_size: int) -> np.ndarray:
+        ...
+
+
+class TorchBackend(EmbeddingBackend):
+    name = "torch"
+
+    def __init__(self, model_dir: str | None = None, threads: int = 0):
+        import torch
+        from sentence_transformers import SentenceTransformer
+
+        if threads:
+            torch.set_num_threads(threads)
+
+        self.model = SentenceTransformer(model_dir or DEFAULT_MODEL_NAME, device="cpu")
+        self.tokenizer = self.model.tokenizer
+        self.max_seq_length = self.model.max_seq_length
+        self.dimension = self.model.get_sentence_embedding_dimension()
+
+    def encode(self, texts: list, batch_size: int) -> np.ndarray:
+        return self.model.encode(
+            texts,
+            batch_size=batch_size,
+            normalize_embeddings=True,
+            convert_to_numpy=True
+        ).astype(np.float32, copy=False)
+
+
+class OnnxBackend(EmbeddingBackend):
+    """
+    ONNX Runtime on CPU, from a directory written by scripts/export_onnx_model.py.
+    With quantize=True the int8 dynamically quantized graph is used (and
+    created next to model.onnx on first load if missing).
+    """
+
+    name = "onnx"
+
+    def __init__(self, model_dir: str, quantize: bool = False, threads: int = 0):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        if not model_dir:
+            raise ValueError("EMBEDDING_MODEL_DIR is required for the onnx embedding backend")
+
+        model_path = os.path.join(model_dir, ONNX_MODEL_FILE)
+        if quantize:
+            model_path = self._quantized(model_dir)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.max_seq_length = self._read_max_seq_length(model_dir)
+        self.dimension = self.session.get_outputs()[0].shape[-1]
+        self.name = "onnx-int8" if quantize else "onnx"
+
+    @staticmethod
+    def _quantized(model_dir: str) -> str:
+        quantized_path = os.path.join(model_dir, ONNX_QUANTIZED_MODEL_FILE)
+
+        if not os.path.exists(quantized_path):
+            from onnxruntime.quantization import quantize_dynamic, QuantType
+
+            quantize_dynamic(
+                os.path.join(model_dir, ONNX_MODEL_FILE),
+                quantized_path,
+                weight_type=QuantType.QInt8
+            )
+
+        return quantized_path
+
+    @staticmethod
+    def _read_max_seq_length(model_dir: str) -> int:
+        config_path = os.path.join(model_dir, "sentence_bert_config.json")
+
+        if os.path.exists(config_path):
+            with open(config_path) as f:
+                return int(json.load(f).get("max_seq_length", DEFAULT_MAX_SEQ_LENGTH))
+
+        return DEFAULT_MAX_SEQ_LENGTH
+
+    def encode(self, texts: list, batch_size: int) -> np.ndarray:
+        batches = []
+
+        for start in range(0, len(texts), batch_size):
+            encoded = self.tokenizer(
+                texts[start:start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np"
+            )
+            feed = {
+                name: encoded[name].astype(np.int64)
+                for name in ("input_ids", "attention_mask", "token_type_ids")
+                if name in self.input_names and name in encoded
+            }
+
+            hidden = self.session.run(None, feed)[0]
+
+            # Mean pooling over real tokens, then L2-normalize (as sentence-transformers does)
+            mask = encoded["attention_mask"][..., None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+
+            batches.append(pooled.astype(np.float32, copy=False))
+
+        return np.vstack(batches)
+
+
+def load_backend(name: str, model_dir: str | None = None, quantize: bool = False, threads: int = 0) -> EmbeddingBackend:
+    if name == "torch":
+        return TorchBackend(model_dir, threads=threads)
+    if name == "onnx":
+        return OnnxBackend(model_dir, quantize=quantize, threads=threads)
+
+    raise ValueError(f"Unknown EMBEDDING_BACKEND: {name}")
@@ -0,0 +1,80 @@
+import os
+import numpy as np
+
+# Storage format for ResumeChunk.embedding_vector: float32 | float16 | int8
+EMBEDDING_STORAGE_DTYPE = os.getenv("EMBEDDING_STORAGE_DTYPE", "float32")
+
+# Little-endian on disk regardless of host byte order
+_NUMPY_DTYPES = {
+    "float32": np.dtype("<f4"),
+    "float16": np.dtype("<f2"),
+    "int8": np.dtype("i1"),
+}
+
+if EMBEDDING_STORAGE_DTYPE not in _NUMPY_DTYPES:
+    raise ValueError(f"Unsupported EMBEDDING_STORAGE_DTYPE: {EMBEDDING_STORAGE_DTYPE}")
+
+
+def encode_embedding(vector, dtype: str = EMBEDDING_STORAGE_DTYPE):
+    """
+    Packs a vector into raw bytes.
+    Returns (blob, scale); scale is only set for int8.
+    """
+
+    vector = np.asarray(vector, dtype=np.float32)
+
+    if dtype == "int8":
+        max_abs = float(np.abs(vector).max()) if vector.size else 0.0
+        scale = max_abs / 127.0 if max_abs > 0 else 1.0
+        quantized = np.clip(np.rint(vector / scale), -127, 127)
+        return quantized.astype(_NUMPY_DTYPES["int8"]).tobytes(), scale
+
+    return vector.astype(_NUMPY_DTYPES[dtype]).tobytes(), None
+
+
+def decode_embedding(blob: bytes, dtype: str = "float32", scale: float | None = None) -> np.ndarray:
+    vector = np.frombuffer(blob, dtype=_NUMPY_DTYPES[dtype])
+
+    if dtype == "float32":
+        return vector  # zero-copy, read-only view over the blob
+    if dtype == "int8":
+        return vector.astype(np.float32) * np.float32(scale)
+    return vector.astype(np.float32)
+
+
+def chunk_embedding(chunk) -> np.ndarray:
+    # Rows written before the binary column existed still carry JSON
+    if chunk.embedding_vector is None:
+        return np.asarray(chunk.embedding, dtype=np.float32)
+
+    return decode_embedding(chunk.embedding_vector, chunk.embedding_dtype, chunk.embedding_scale)
+
+
+def decode_embedding_matrix(chunks) -> np.ndarray:
+    """
+    Builds an (n, dim) float32 matrix from ResumeChunk rows.
+    When every row shares one binary dtype the blobs are decoded in a single
+    np.frombuffer call instead of row by row.
+    """
+
+    if not chunks:
+        return np.empty((0, 0), dtype=np.float32)
+
+    dtypes = {c.embedding_dtype for c in chunks}
+    legacy = any(c.embedding_vector is None for c in chunks)
+
+    if legacy or len(dtypes) != 1:
+        return np.vstack([chunk_embedding(c) for c in chunks]).astype(np.float32, copy=False)
+
+    dtype = dtypes.pop()
+    matrix = np.frombuffer(
+        b"".join(c.embedding_vector for c in chunks),
+        dtype=_NUMPY_DTYPES[dtype]
+    ).reshape(len(chunks), -1)
+
+    if dtype == "float32":
+        return matrix
+    if dtype == "int8":
+        scales = np.array([c.embedding_scale for c in chunks], dtype=np.float32)
+        return matrix.astype(np.float32) * scales[:, None]
+    return matrix.astype(np.float32)
@@ -0,0 +1,257 @@
+"""
+Optional shared embedding process.
+
+One process holds the model and serves every uvicorn worker over a Unix
+socket, merging concurrent requests into micro-batches. Start it with:
+
+    python -m app.utils.embedding_service
+
+and point workers at it with EMBEDDING_SERVICE_SOCKET. Workers fall back
+to the in-process model whenever the socket is unreachable.
+
+Wire format (both directions): 4-byte big-endian header length, a JSON
+header, then header["body_bytes"] bytes of body. Encode responses carry
+rows x dim little-endian float32 values as the body.
+"""
+import asyncio
+import json
+import os
+import socket
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+EMBEDDING_SERVICE_SOCKET = os.getenv("EMBEDDING_SERVICE_SOCKET")
+
+# Micro-batching: flush when this many texts are queued or the oldest waited this long
+EMBEDDING_SERVICE_MAX_BATCH = int(os.getenv("EMBEDDING_SERVICE_MAX_BATCH", "64"))
+EMBEDDING_SERVICE_MAX_WAIT_MS = float(os.getenv("EMBEDDING_SERVICE_MAX_WAIT_MS", "5"))
+
+EMBEDDING_SERVICE_TIMEOUT_SECONDS = float(os.getenv("EMBEDDING_SERVICE_TIMEOUT_SECONDS", "30"))
+# After a failed connection, workers stay in-process this long before retrying
+EMBEDDING_SERVICE_RETRY_SECONDS = float(os.getenv("EMBEDDING_SERVICE_RETRY_SECONDS", "5"))
+
+_LENGTH = struct.Struct("!I")
+
+
+class EmbeddingServiceUnavailable(Exception):
+    pass
+
+
+class EmbeddingServiceError(EmbeddingServiceUnavailable):
+    # The service answered but failed to encode; callers fall back the same way
+    pass
+
+
+def _pack(header: dict, body: bytes = b"") -> bytes:
+    header = dict(header, body_bytes=len(body))
+    data = json.dumps(header).encode("utf-8")
+    return _LENGTH.pack(len(data)) + data + body
+
+
+def _recv_exact(sock, size: int) -> bytes:
+    buffer = bytearray()
+    while len(buffer) < size:
+        block = sock.recv(size - len(buffer))
+        if not block:
+            raise ConnectionError("Embedding service closed the connection")
+        buffer += block
+    return bytes(buffer)
+
+
+def _recv_message(sock):
+    (length,) = _LENGTH.unpack(_recv_exact(sock, _LENGTH.size))
+    header = json.loads(_recv_exact(sock, length))
+    body = _recv_exact(sock, header.get("body_bytes", 0))
+    return header, body
+
+
+# ---------------- CLIENT (uvicorn workers) ----------------
+class EmbeddingServiceClient:
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._down_until = 0.0
+        self._info = None
+
+    def available(self) -> bool:
+        return time.monotonic() >= self._down_until
+
+    def _socket(self):
+        sock = getattr(self._local, "sock", None)
+
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(EMBEDDING_SERVICE_TIMEOUT_SECONDS)
+            try:
+                sock.connect(self.path)
+            except OSError:
+                sock.close()
+                raise
+            self._local.sock = sock
+
+        return sock
+
+    def _request(self, header: dict):
+        try:
+            sock = self._socket()
+            sock.sendall(_pack(header))
+            return _recv_message(sock)
+        except (OSError, ValueError) as e:
+            # Covers missing socket, refused/reset connections and timeouts
+            sock = getattr(self._local, "sock", None)
+            if sock is not None:
+                sock.close()
+                self._local.sock = None
+            self._down_until = time.monotonic() + EMBEDDING_SERVICE_RETRY_SECONDS
+            raise EmbeddingServiceUnavailable(str(e))
+
+    def info(self) -> dict:
+        if self._info is None:
+            header, _ = self._request({"op": "info"})
+            self._info = header
+        return self._info
+
+    def encode(self, texts: list) -> np.ndarray:
+        header, body = self._request({"op": "encode", "texts": texts})
+
+        if "error" in header:
+            raise EmbeddingServiceError(f"Embedding service error: {header['error']}")
+
+        return np.frombuffer(body, dtype="<f4").reshape(header["rows"], header["dim"])
+
+
+# ---------------- SERVER (sidecar process) ----------------
+class MicroBatcher:
+    """
+    Collects texts from concurrent requests and encodes them together.
+    The model runs on a single thread, off the event loop.
+    """
+
+    def __init__(self, encode, max_batch: int, max_wait_ms: float):
+        self._encode = encode
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._queue = asyncio.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embed")
+
+    async def submit(self, texts: list) -> np.ndarray:
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((texts, future))
+        return await future
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            items = [await self._queue.get()]
+            count = len(items[0][0])
+            deadline = loop.time() + self.max_wait
+
+            while count < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                items.append(item)
+                count += len(item[0])
+
+            texts = [text for batch, _ in items for text in batch]
+
+            try:
+                vectors = await loop.run_in_executor(self._executor, self._encode, texts)
+            except Exception as e:
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            offset = 0
+            for batch, future in items:
+                if not future.done():
+                    future.set_result(vectors[offset:offset + len(batch)])
+                offset += len(batch)
+
+
+async def _read_message(reader):
+    (length,) = _LENGTH.unpack(await reader.readexactly(_LENGTH.size))
+    header = json.loads(await reader.readexactly(length))
+    body = await reader.readexactly(header.get("body_bytes", 0))
+    return header, body
+
+
+async def serve(path: str):
+    from app.utils import embedding
+    from app.utils.embedding_backends import DEFAULT_TOKENIZER_NAME
+
+    backend = embedding.get_backend()
+    backend.encode(["warm up"], batch_size=1)
+
+    info = {
+        "backend": backend.name,
+        "dimension": backend.dimension,
+        "max_seq_length": backend.max_seq_length,
+        "tokenizer": embedding.EMBEDDING_MODEL_DIR or DEFAULT_TOKENIZER_NAME,
+    }
+
+    batcher = MicroBatcher(
+        lambda texts: backend.encode(texts, batch_size=EMBEDDING_SERVICE_MAX_BATCH),
+        max_batch=EMBEDDING_SERVICE_MAX_BATCH,
+        max_wait_ms=EMBEDDING_SERVICE_MAX_WAIT_MS
+    )
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                header, _ = await _read_message(reader)
+                op = header.get("op")
+
+                if op == "info":
+                    writer.write(_pack(info))
+                elif op == "encode":
+                    try:
+                        vectors = await batcher.submit(header.get("texts") or [])
+                        body = np.ascontiguousarray(vectors, dtype="<f4").tobytes()
+                        writer.write(_pack({"rows": len(vectors), "dim": info["dimension"]}, body))
+                    except Exception as e:
+                        writer.write(_pack({"error": str(e)}))
+                else:
+                    writer.write(_pack({"error": f"Unknown op: {op}"}))
+
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    if os.path.exists(path):
+        os.unlink(path)
+
+    server = await asyncio.start_unix_server(handle, path=path)
+    os.chmod(path, 0o660)
+
+    batch_task = asyncio.create_task(batcher.run())
+    print(f"Embedding service ({backend.name}) listening on {path}")
+
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        batch_task.cancel()
+
+
+def main():
+    if not EMBEDDING_SERVICE_SOCKET:
+        raise SystemExit("Set EMBEDDING_SERVICE_SOCKET to the Unix socket path to listen on")
+
+    asyncio.run(serve(EMBEDDING_SERVICE_SOCKET))
+
+
+if __name__ == "__main__":
+    main()
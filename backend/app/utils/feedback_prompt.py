@@ -1,13 +1,35 @@
-def build_feedback_prompt(interview_type: str, qa_pairs: list) -> str:
+from app.utils.prompt_budget import (
+    EVALUATION_PROMPT_TOKEN_BUDGET,
+    FEEDBACK_PROMPT_TOKEN_BUDGET,
+    QUESTION_TOKEN_CAP,
+    compact_text,
+    fit_prompt
+)
+
+
+def build_feedback_prompt(interview_type: str, qa_pairs: list, budget: int = FEEDBACK_PROMPT_TOKEN_BUDGET) -> str:
+    questions = [compact_text(qa["question"], QUESTION_TOKEN_CAP) for qa in qa_pairs]
+    answers = [qa["answer"] for qa in qa_pairs]
+
+    return fit_prompt(
+        "feedback",
+        lambda fitted: _render_feedback_prompt(interview_type, questions, fitted),
+        answers,
+        questions,
+        budget
+    )
+
+
+def _render_feedback_prompt(interview_type: str, questions: list, answers: list) -> str:
     formatted_qa = ""
 
-    for idx, qa in enumerate(qa_pairs, start=1):
+    for idx, (question, answer) in enumerate(zip(questions, answers), start=1):
         formatted_qa += f"""
 Question {idx}:
-{qa['question']}
+{question}
 
 Answer:
-{qa['answer']}
+{answer}
 """
 
     prompt = f"""
@@ -37,3 +59,92 @@ Rules:
 """
 
     return prompt.strip()
+
+
+def build_answer_evaluation_prompt(
+    interview_type: str,
+    question: str,
+    answer: str,
+    budget: int = EVALUATION_PROMPT_TOKEN_BUDGET
+) -> str:
+    question = compact_text(question, QUESTION_TOKEN_CAP)
+
+    return fit_prompt(
+        "answer_evaluation",
+        lambda fitted: _render_answer_evaluation_prompt(interview_type, question, fitted[0]),
+        [answer],
+        [question],
+        budget
+    )
+
+
+def _render_answer_evaluation_prompt(interview_type: str, question: str, answer: str) -> str:
+    prompt = f"""
+You are an expert interview evaluator.
+
+Interview type: {interview_type}
+
+Question:
+{question}
+
+Answer:
+{answer}
+
+Evaluate ONLY this answer and return STRICTLY JSON with this format:
+
+{{
+  "score": number (0-10),
+  "strengths": [list of short strings],
+  "weaknesses": [list of short strings],
+  "communication": string (one sentence),
+  "technical": string (one sentence)
+}}
+
+Rules:
+- Be honest but constructive
+- Do NOT include explanations outside JSON
+- Do NOT add extra fields
+"""
+
+    return prompt.strip()
+
+
+def build_feedback_summary_prompt(interview_type: str, evaluations: list, overall_score: float) -> str:
+    formatted = ""
+
+    for idx, evaluation in enumerate(evaluations, start=1):
+        formatted += f"""
+Question {idx} (score {evaluation.get('score')}/10):
+Strengths: {'; '.join(evaluation.get('strengths', []))}
+Weaknesses: {'; '.join(evaluation.get('weaknesses', []))}
+Communication: {evaluation.get('communication', '')}
+Technical: {evaluation.get('technical', '')}
+"""
+
+    prompt = f"""
+You are an expert interview evaluator.
+
+Interview type: {interview_type}
+
+Each answer has already been scored. Average score: {overall_score}/10.
+
+{formatted}
+
+Summarize these evaluations into final feedback STRICTLY in JSON with this format:
+
+{{
+  "overall_score": number (0-10),
+  "strengths": [list of strings],
+  "weaknesses": [list of strings],
+  "communication_feedback": string,
+  "technical_feedback": string,
+  "suggestions": [list of strings]
+}}
+
+Rules:
+- Be honest but constructive
+- Do NOT include explanations outside JSON
+- Do NOT add extra fields
+"""
+
+    return prompt.strip()
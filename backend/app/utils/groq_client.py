@@ -1,19 +1,122 @@
 import os
-from groq import Groq
+import threading
+
+from app.utils.metrics import stage_timer, record_llm_usage
+
+GROQ_MODEL = "llama-3.1-8b-instant"
+SYSTEM_PROMPT = "You are a professional interview bot."
+
+# Shared connection pool settings for the async client
+GROQ_TIMEOUT_SECONDS = float(os.getenv("GROQ_TIMEOUT_SECONDS", "30"))
+GROQ_CONNECT_TIMEOUT_SECONDS = float(os.getenv("GROQ_CONNECT_TIMEOUT_SECONDS", "5"))
+GROQ_MAX_CONNECTIONS = int(os.getenv("GROQ_MAX_CONNECTIONS", "100"))
+GROQ_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("GROQ_MAX_KEEPALIVE_CONNECTIONS", "20"))
+
+# Clients (and the groq/httpx imports) are created on first use, not at import
+_client = None
+_client_lock = threading.Lock()
+_async_client = None
+
+
+def get_client():
+    global _client
+
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from groq import Groq
+
+                _client = Groq(
+                    api_key=os.getenv("GROQ_API_KEY")
+                )
+
+    return _client
+
+
+def get_async_client():
+    # Created on first use so it binds to the running event loop
+    global _async_client
+
+    if _async_client is None:
+        import httpx
+        from groq import AsyncGroq
+
+        _async_client = AsyncGroq(
+            api_key=os.getenv("GROQ_API_KEY"),
+            http_client=httpx.AsyncClient(
+                timeout=httpx.Timeout(GROQ_TIMEOUT_SECONDS, connect=GROQ_CONNECT_TIMEOUT_SECONDS),
+                limits=httpx.Limits(
+                    max_connections=GROQ_MAX_CONNECTIONS,
+                    max_keepalive_connections=GROQ_MAX_KEEPALIVE_CONNECTIONS
+                )
+            )
+        )
+
+    return _async_client
+
+
+async def close_async_client():
+    global _async_client
+
+    if _async_client is not None:
+        await _async_client.close()
+        _async_client = None
+
+
+def _messages(prompt: str) -> list:
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
 
-client = Groq(
-    api_key=os.getenv("GROQ_API_KEY")
-)
 
 def generate_with_groq(prompt: str, max_tokens: int = 500) -> str:
-    response = client.chat.completions.create(
-        model="llama-3.1-8b-instant",
-        messages=[
-            {"role": "system", "content": "You are a professional interview bot."},
-            {"role": "user", "content": prompt}
-        ],
-        temperature=0.7,
-        max_tokens=max_tokens
-    )
+    with stage_timer("llm"):
+        response = get_client().chat.completions.create(
+            model=GROQ_MODEL,
+            messages=_messages(prompt),
+            temperature=0.7,
+            max_tokens=max_tokens
+        )
+
+    record_llm_usage(response.usage)
+    return response.choices[0].message.content.strip()
 
+
+async def agenerate_with_groq(prompt: str, max_tokens: int = 500) -> str:
+    with stage_timer("llm"):
+        response = await get_async_client().chat.completions.create(
+            model=GROQ_MODEL,
+            messages=_messages(prompt),
+            temperature=0.7,
+            max_tokens=max_tokens
+        )
+
+    record_llm_usage(response.usage)
     return response.choices[0].message.content.strip()
+
+
+async def stream_with_groq(prompt: str, max_tokens: int = 500):
+    """
+    Yields text deltas as the model produces them.
+    """
+
+    # Timed to the last token; includes time the client takes to read the stream
+    with stage_timer("llm"):
+        stream = await get_async_client().chat.completions.create(
+            model=GROQ_MODEL,
+            messages=_messages(prompt),
+            temperature=0.7,
+            max_tokens=max_tokens,
+            stream=True
+        )
+
+        async for chunk in stream:
+            # Groq reports usage on the final chunk
+            x_groq = getattr(chunk, "x_groq", None)
+            if x_groq is not None:
+                record_llm_usage(getattr(x_groq, "usage", None))
+
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                yield delta
@@ -0,0 +1,69 @@
+import os
+from itertools import islice
+
+import numpy as np
+
+from app.utils.embedding import embed_texts, get_tokenizer, max_chunk_tokens, EMBED_BATCH_SIZE
+from app.utils.pdf_extractor import iter_pdf_pages_offloaded
+from app.utils.text_chunker import iter_chunks, iter_token_chunks
+from app.utils.text_cleaner import iter_clean_pages
+
+# "tokens": fill the embedding model window exactly; "chars": legacy 1000-char windows
+CHUNK_STRATEGY = os.getenv("CHUNK_STRATEGY", "tokens")
+
+
+class ResumeIngestion:
+    def __init__(self, text: str, chunks: list, embeddings: np.ndarray):
+        self.text = text
+        self.chunks = chunks
+        self.embeddings = embeddings
+
+
+def iter_resume_chunks(pieces, strategy: str = CHUNK_STRATEGY):
+    if strategy == "chars":
+        return iter_chunks(pieces)
+
+    return iter_token_chunks(pieces, get_tokenizer(), max_chunk_tokens())
+
+
+def _collect(pieces, sink: list):
+    for piece in pieces:
+        sink.append(piece)
+        yield piece
+
+
+def ingest_pdf(source, batch_size: int = EMBED_BATCH_SIZE) -> ResumeIngestion:
+    """
+    source is a file path or the raw PDF bytes.
+    Extracts, cleans, chunks and embeds a PDF as a pipeline: each batch of
+    chunks is embedded as soon as it is complete, while the PDF pool keeps
+    parsing later pages.
+    """
+
+    cleaned_pages = []
+    chunk_stream = iter_resume_chunks(
+        _collect(iter_clean_pages(iter_pdf_pages_offloaded(source)), cleaned_pages)
+    )
+
+    chunks = []
+    embedding_batches = []
+
+    while True:
+        batch = list(islice(chunk_stream, batch_size))
+        if not batch:
+            break
+
+        chunks.extend(batch)
+        embedding_batches.append(embed_texts(batch, batch_size=batch_size))
+
+    embeddings = (
+        np.vstack(embedding_batches)
+        if embedding_batches
+        else embed_texts([])
+    )
+
+    return ResumeIngestion(
+        text="".join(cleaned_pages).strip(),
+        chunks=chunks,
+        embeddings=embeddings
+    )
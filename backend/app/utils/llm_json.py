@@ -0,0 +1,22 @@
+import json
+import re
+
+
+def parse_json_response(ai_response: str) -> dict:
+    """
+    Parses a JSON object out of an LLM reply.
+    Raises ValueError if there is none, json.JSONDecodeError if it is malformed.
+    """
+
+    # First, try direct parsing
+    try:
+        return json.loads(ai_response)
+    except json.JSONDecodeError:
+        pass
+
+    # If direct parsing fails, try to extract JSON object
+    json_match = re.search(r"\{[\s\S]*\}", ai_response)
+    if not json_match:
+        raise ValueError("AI did not return valid JSON")
+
+    return json.loads(json_match.group())
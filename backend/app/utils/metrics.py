@@ -0,0 +1,264 @@
+"""
+In-process Prometheus metrics: request and per-stage latency histograms,
+LLM token counts and error counters, rendered as text by /metrics.
+
+Stage timings are labelled with the route of the request they ran under
+(a ContextVar set by MetricsMiddleware); work on background threads is
+labelled "background". Each worker process keeps its own registry.
+"""
+import bisect
+import functools
+import inspect
+import threading
+from contextvars import ContextVar
+from time import perf_counter
+
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+_request_scope = ContextVar("metrics_request_scope", default=None)
+
+
+def current_route() -> str:
+    scope = _request_scope.get()
+    if scope is None:
+        return "background"
+
+    # FastAPI puts the matched route in the scope once routing is done
+    route = scope.get("route")
+    return route.path if route is not None else "unmatched"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_text(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: tuple, buckets: tuple = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: tuple, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+
+        with self._lock:
+            snapshot = [(labels, list(s[0]), s[1], s[2]) for labels, s in self._series.items()]
+
+        for labels, counts, total, count in sorted(snapshot):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{bound!r}"'
+                lines.append(f"{self.name}_bucket{_label_text(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_label_text(self.labelnames, labels)} {total}")
+            lines.append(f"{self.name}_count{_label_text(self.labelnames, labels)} {count}")
+
+        return lines
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: tuple):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: tuple, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+
+        with self._lock:
+            snapshot = sorted(self._values.items())
+
+        for labels, value in snapshot:
+            lines.append(f"{self.name}{_label_text(self.labelnames, labels)} {value}")
+
+        return lines
+
+
+# ---------------- registry ----------------
+request_duration = Histogram(
+    "http_request_duration_seconds", "HTTP request latency.", ("route", "method", "status")
+)
+stage_duration = Histogram(
+    "stage_duration_seconds", "Latency of one stage of request handling.", ("route", "stage")
+)
+llm_tokens = Counter(
+    "llm_tokens_total", "Tokens sent to and generated by the LLM.", ("route", "kind")
+)
+errors = Counter(
+    "errors_total", "Exceptions raised, by the stage that raised them.", ("route", "stage")
+)
+
+prompt_tokens = Histogram(
+    "prompt_tokens", "Size of each prompt sent to the LLM, in tokens.", ("route", "prompt"),
+    buckets=(64, 128, 256, 512, 1024, 2048, 4096, 8192)
+)
+prompt_compactions = Counter(
+    "prompt_compactions_total", "Prompts whose content was shortened to fit the token budget.", ("route", "prompt")
+)
+
+REGISTRY = (request_duration, stage_duration, llm_tokens, errors, prompt_tokens, prompt_compactions)
+
+
+def render_metrics() -> str:
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# ---------------- hooks ----------------
+class stage_timer:
+    """
+    with stage_timer("embedding"): ...
+    Records the block's duration, and an error if it raises.
+    """
+
+    __slots__ = ("stage", "start")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        route = current_route()
+        stage_duration.observe((route, self.stage), perf_counter() - self.start)
+        # Not GeneratorExit/CancelledError: a client going away isn't a failure
+        if exc_type is not None and issubclass(exc_type, Exception):
+            errors.inc((route, self.stage))
+        return False
+
+
+def timed_stage(stage: str):
+    """
+    Decorator form of stage_timer for sync and async functions.
+    """
+
+    def decorate(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with stage_timer(stage):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with stage_timer(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    return decorate
+
+
+def record_llm_usage(usage):
+    if usage is None:
+        return
+
+    route = current_route()
+    prompt_tokens = getattr(usage, "prompt_tokens", None)
+    completion_tokens = getattr(usage, "completion_tokens", None)
+
+    if prompt_tokens:
+        llm_tokens.inc((route, "prompt"), prompt_tokens)
+    if completion_tokens:
+        llm_tokens.inc((route, "completion"), completion_tokens)
+
+
+def record_prompt_tokens(prompt: str, tokens: int, compacted: bool):
+    route = current_route()
+    prompt_tokens.observe((route, prompt), tokens)
+    if compacted:
+        prompt_compactions.inc((route, prompt))
+
+
+def instrument_engine(engine):
+    """
+    Times every statement on a (sync) SQLAlchemy engine as the "db" stage.
+    For an AsyncEngine pass engine.sync_engine.
+    """
+
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_query_start", []).append(perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        start = conn.info["metrics_query_start"].pop()
+        stage_duration.observe((current_route(), "db"), perf_counter() - start)
+
+    @event.listens_for(engine, "handle_error")
+    def _error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("metrics_query_start"):
+            conn.info["metrics_query_start"].pop()
+        errors.inc((current_route(), "db"))
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware: request latency by route template, method and status.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = _request_scope.set(scope)
+        start = perf_counter()
+        status = [500]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        except Exception:
+            errors.inc((current_route(), "request"))
+            raise
+        finally:
+            request_duration.observe(
+                (current_route(), scope["method"], str(status[0])),
+                perf_counter() - start
+            )
+            _request_scope.reset(token)
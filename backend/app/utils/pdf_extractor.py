@@ -1,10 +1,171 @@
-import fitz  # PyMuPDF
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+
+from app.utils.metrics import stage_timer
+
+# Caps on what a single upload may cost us
+PDF_MAX_BYTES = int(os.getenv("PDF_MAX_BYTES", str(10 * 1024 * 1024)))
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "50"))
+
+# PyMuPDF runs in separate processes so a hostile PDF can't wedge a request thread
+PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", "2"))
+PDF_PAGES_PER_TASK = int(os.getenv("PDF_PAGES_PER_TASK", "4"))
+PDF_EXTRACT_TIMEOUT_SECONDS = float(os.getenv("PDF_EXTRACT_TIMEOUT_SECONDS", "30"))
+
+
+class PdfExtractionError(ValueError):
+    pass
+
+
+class PdfTooLargeError(PdfExtractionError):
+    pass
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=PDF_EXTRACT_WORKERS)
+        return _executor
+
+
+def shutdown_pdf_executor():
+    global _executor
+
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+def _discard_executor(executor: ProcessPoolExecutor):
+    """
+    Kills a pool whose worker is stuck on a PDF; the next upload starts a
+    fresh one. Other uploads still using it fail with PdfExtractionError.
+    """
+
+    global _executor
+
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+
+    # shutdown() alone would leave the stuck PyMuPDF call running
+    for process in list((executor._processes or {}).values()):
+        process.kill()
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _open(source):
+    # Imported here so only the extraction processes pay for PyMuPDF
+    import fitz
+
+    # source is a file path or the raw PDF bytes
+    if isinstance(source, (bytes, bytearray)):
+        return fitz.open(stream=source, filetype="pdf")
+    return fitz.open(source)
 
-def extract_text_from_pdf(file_path: str) -> str:
-    text = ""
 
-    with fitz.open(file_path) as pdf:
+def _check_size(source):
+    size = len(source) if isinstance(source, (bytes, bytearray)) else os.path.getsize(source)
+    if size > PDF_MAX_BYTES:
+        raise PdfTooLargeError(f"PDF is {size} bytes; the limit is {PDF_MAX_BYTES}")
+
+
+def _page_count(source) -> int:
+    with _open(source) as pdf:
+        return pdf.page_count
+
+
+def _extract_page_range(source, start: int, stop: int) -> list:
+    with _open(source) as pdf:
+        return [pdf[i].get_text() for i in range(start, stop)]
+
+
+def iter_pdf_pages(source):
+    """
+    Yields the text of each page in order, parsing in-process.
+    """
+
+    _check_size(source)
+
+    with _open(source) as pdf:
+        if pdf.page_count > PDF_MAX_PAGES:
+            raise PdfTooLargeError(f"PDF has {pdf.page_count} pages; the limit is {PDF_MAX_PAGES}")
+
         for page in pdf:
-            text += page.get_text()
+            with stage_timer("pdf_extraction"):
+                text = page.get_text()
+            yield text
+
+
+def iter_pdf_pages_offloaded(source):
+    """
+    Yields the text of each page in order, parsed in the PDF process pool.
+    All page ranges are submitted up front, so later pages are parsed while
+    the caller is still consuming earlier ones.
+    """
+
+    _check_size(source)
 
-    return text.strip()
+    if not isinstance(source, (bytes, bytearray)):
+        yield from _iter_pool_pages(source)
+        return
+
+    # Tasks get a path: pickling the bytes would copy the PDF into every task
+    with tempfile.NamedTemporaryFile(suffix=".pdf") as spool:
+        spool.write(source)
+        spool.flush()
+        yield from _iter_pool_pages(spool.name)
+
+
+def _iter_pool_pages(path: str):
+    executor = _get_executor()
+
+    try:
+        with stage_timer("pdf_extraction"):
+            page_count = executor.submit(_page_count, path).result(timeout=PDF_EXTRACT_TIMEOUT_SECONDS)
+    except TimeoutError:
+        _discard_executor(executor)
+        raise PdfExtractionError("Timed out reading PDF")
+    except PdfExtractionError:
+        raise
+    except Exception as e:
+        raise PdfExtractionError(f"Could not read PDF: {str(e)}")
+
+    if page_count > PDF_MAX_PAGES:
+        raise PdfTooLargeError(f"PDF has {page_count} pages; the limit is {PDF_MAX_PAGES}")
+
+    futures = [
+        executor.submit(_extract_page_range, path, start, min(start + PDF_PAGES_PER_TASK, page_count))
+        for start in range(0, page_count, PDF_PAGES_PER_TASK)
+    ]
+
+    try:
+        for future in futures:
+            try:
+                # Only the time spent waiting on the pool; parsing overlaps embedding
+                with stage_timer("pdf_extraction"):
+                    pages = future.result(timeout=PDF_EXTRACT_TIMEOUT_SECONDS)
+            except TimeoutError:
+                _discard_executor(executor)
+                raise PdfExtractionError("Timed out extracting PDF text")
+            except Exception as e:
+                raise PdfExtractionError(f"Could not extract PDF text: {str(e)}")
+
+            yield from pages
+    finally:
+        # Caller stopped early or something failed: drop queued work
+        for future in futures:
+            future.cancel()
+
+
+def extract_text_from_pdf(file_path: str) -> str:
+    return "".join(iter_pdf_pages(file_path)).strip()
@@ -0,0 +1,97 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "1") == "1"
+PREFETCH_WORKERS = int(os.getenv("PREFETCH_WORKERS", "4"))
+
+# How long /interview/question waits on an in-flight prefetch before generating live
+PREFETCH_WAIT_SECONDS = float(os.getenv("PREFETCH_WAIT_SECONDS", "20"))
+
+# Prefetched questions older than this belong to abandoned sessions
+PREFETCH_TTL_SECONDS = int(os.getenv("PREFETCH_TTL_SECONDS", "1800"))
+
+
+class Prefetcher:
+    """
+    Runs at most one background job per key on a small dedicated pool.
+    Jobs receive a threading.Event and must not publish results once it is set.
+    """
+
+    def __init__(self, max_workers: int = PREFETCH_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def schedule(self, key, job) -> bool:
+        with self._lock:
+            if key in self._inflight:
+                return False
+
+            cancelled = threading.Event()
+            future = self._executor.submit(job, cancelled)
+            self._inflight[key] = (future, cancelled)
+
+        future.add_done_callback(lambda _: self._forget(key, future))
+        return True
+
+    def wait(self, key, timeout: float = PREFETCH_WAIT_SECONDS) -> bool:
+        """
+        Blocks until the in-flight job for key finishes.
+        Returns False if there was none or it did not finish in time.
+        """
+
+        with self._lock:
+            entry = self._inflight.get(key)
+
+        if entry is None:
+            return False
+
+        try:
+            entry[0].result(timeout=timeout)
+        except TimeoutError:
+            return False
+        except Exception:
+            return False
+
+        return True
+
+    async def wait_async(self, key, timeout: float = PREFETCH_WAIT_SECONDS) -> bool:
+        """
+        wait() for async routes: suspends the caller instead of holding a thread.
+        """
+
+        with self._lock:
+            entry = self._inflight.get(key)
+
+        if entry is None:
+            return False
+
+        try:
+            # shield: timing out must not cancel the job itself
+            await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(entry[0])), timeout)
+        except asyncio.TimeoutError:
+            return False
+        except Exception:
+            return False
+
+        return True
+
+    def cancel(self, key):
+        with self._lock:
+            entry = self._inflight.pop(key, None)
+
+        if entry is not None:
+            future, cancelled = entry
+            cancelled.set()
+            future.cancel()
+
+    def _forget(self, key, future):
+        with self._lock:
+            entry = self._inflight.get(key)
+            if entry is not None and entry[0] is future:
+                del self._inflight[key]
+
+
+question_prefetcher = Prefetcher()
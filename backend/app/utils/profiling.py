@@ -0,0 +1,170 @@
+"""
+Opt-in per-request profiling.
+
+A request is profiled when it carries X-Profile-Token matching
+PROFILE_ADMIN_TOKEN, or at random with probability PROFILE_SAMPLE_RATE.
+While it runs, a sampler thread records the Python stack of every busy
+thread each PROFILE_INTERVAL_MS (handlers hop between the event loop and
+threadpool/executor threads, so sampling one thread would miss work).
+Idle threads are skipped; other requests running at the same moment do show up.
+
+Stacks are written in the collapsed "folded" format that flamegraph.pl,
+inferno and speedscope read, as PROFILE_DIR/<time>_<route>_<request id>.folded.
+Only the newest PROFILE_MAX_FILES captures are kept.
+"""
+import hmac
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+from starlette.concurrency import run_in_threadpool
+
+PROFILE_ADMIN_TOKEN = os.getenv("PROFILE_ADMIN_TOKEN", "")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "50"))
+
+# One capture at a time: concurrent samplers would each see the other's work
+_capture_slot = threading.BoundedSemaphore(1)
+
+# Top frames of threads that are parked, not working
+_IDLE_FUNCTIONS = {"wait", "select", "poll", "epoll", "_worker", "accept", "_wait_for_tstate_lock"}
+
+
+def _frame_label(code, cache: dict) -> str:
+    label = cache.get(code)
+    if label is None:
+        label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+        cache[code] = label
+    return label
+
+
+class StackSampler(threading.Thread):
+    def __init__(self, interval_seconds: float):
+        super().__init__(name="profile-sampler", daemon=True)
+        self.interval_seconds = interval_seconds
+        self.stacks = Counter()
+        self.samples = 0
+        self._stopped = threading.Event()
+
+    def run(self):
+        me = threading.get_ident()
+        labels = {}
+        names = {}
+
+        while not self._stopped.wait(self.interval_seconds):
+            self.samples += 1
+
+            for ident, frame in sys._current_frames().items():
+                if ident == me or frame.f_code.co_name in _IDLE_FUNCTIONS:
+                    continue
+
+                name = names.get(ident)
+                if name is None:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                    name = names.get(ident, str(ident))
+
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame.f_code, labels))
+                    frame = frame.f_back
+
+                stack.append(name)
+                stack.reverse()
+                self.stacks[";".join(stack)] += 1
+
+    def stop(self) -> Counter:
+        self._stopped.set()
+        self.join()
+        return self.stacks
+
+
+def should_profile(headers: dict) -> bool:
+    token = headers.get(b"x-profile-token")
+    if PROFILE_ADMIN_TOKEN and token is not None:
+        # Bytes: str comparison raises TypeError on non-ASCII header values
+        return hmac.compare_digest(token, PROFILE_ADMIN_TOKEN.encode())
+
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+def profile_path(route: str, request_id: str) -> str:
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", route).strip("_") or "root"
+    request_slug = re.sub(r"[^A-Za-z0-9-]+", "", request_id)[:64]
+    started = f"{time.strftime('%Y%m%dT%H%M%S')}.{time.time_ns() % 10**9:09d}"
+    return os.path.join(PROFILE_DIR, f"{started}_{slug}_{request_slug}.folded")
+
+
+def _route_path(scope) -> str:
+    route = scope.get("route")
+    return route.path if route is not None else scope["path"]
+
+
+def write_profile(stacks: Counter, path: str):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+
+    with open(path, "w") as f:
+        for stack, count in stacks.most_common():
+            f.write(f"{stack} {count}\n")
+
+    # Ring buffer: names sort by capture time
+    captures = sorted(name for name in os.listdir(PROFILE_DIR) if name.endswith(".folded"))
+    for name in captures[:-PROFILE_MAX_FILES]:
+        try:
+            os.remove(os.path.join(PROFILE_DIR, name))
+        except FileNotFoundError:
+            pass
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware; profiled responses carry X-Request-ID and X-Profile-File.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        if not should_profile(headers) or not _capture_slot.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        request_id = headers.get(b"x-request-id", b"").decode("latin-1") or uuid.uuid4().hex
+        sampler = StackSampler(PROFILE_INTERVAL_MS / 1000)
+        sampler.start()
+
+        path = None
+
+        async def send_with_headers(message):
+            nonlocal path
+            if message["type"] == "http.response.start":
+                # Routing is done by now, so the file can be named after the route
+                path = profile_path(_route_path(scope), request_id)
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-request-id", request_id.encode("latin-1")),
+                    (b"x-profile-file", os.path.basename(path).encode("latin-1")),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            stacks = sampler.stop()
+            _capture_slot.release()
+
+            await run_in_threadpool(
+                write_profile,
+                stacks,
+                path or profile_path(_route_path(scope), request_id)
+            )
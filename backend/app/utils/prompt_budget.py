@@ -0,0 +1,202 @@
+"""
+Token budgets for LLM prompts.
+
+Builders measure their fixed template, then fit the variable parts (candidate
+answers, mostly) into what is left of the budget: text that fits is kept
+verbatim, longer text is reduced to its sentences most relevant to the
+question, and a single over-long sentence is truncated. Everything is
+deterministic, so the same transcript always yields the same prompt (and
+the same feedback cache key upstream).
+"""
+import logging
+import os
+import re
+import threading
+
+from app.utils.metrics import record_prompt_tokens
+
+# Hugging Face tokenizer matching the LLM (e.g. a Llama 3 tokenizer);
+# empty uses a word-based estimate that needs no download
+PROMPT_TOKENIZER = os.getenv("PROMPT_TOKENIZER", "")
+
+FEEDBACK_PROMPT_TOKEN_BUDGET = int(os.getenv("FEEDBACK_PROMPT_TOKEN_BUDGET", "3000"))
+FOLLOWUP_PROMPT_TOKEN_BUDGET = int(os.getenv("FOLLOWUP_PROMPT_TOKEN_BUDGET", "800"))
+EVALUATION_PROMPT_TOKEN_BUDGET = int(os.getenv("EVALUATION_PROMPT_TOKEN_BUDGET", "1000"))
+
+# Questions are the interviewer's own text; they rarely need more than this
+QUESTION_TOKEN_CAP = int(os.getenv("QUESTION_TOKEN_CAP", "150"))
+
+OMISSION = " [...] "
+
+# Shortest piece of a sentence worth keeping when the whole one doesn't fit
+MIN_FRAGMENT_TOKENS = 16
+
+logger = logging.getLogger(__name__)
+
+_tokenizer = None
+_tokenizer_lock = threading.Lock()
+
+_WORD = re.compile(r"\w+|[^\w\s]")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+|\n+")
+_TERM = re.compile(r"[a-z0-9][a-z0-9+#.\-]*[a-z0-9+#]|[a-z0-9]")
+_STOPWORDS = frozenset(
+    "a an and are as at be but by can could did do does for from had has have how i if in into is it its "
+    "me my of on or our so that the their them then there these they this to was we were what when where "
+    "which who why will with would you your about also just like very really".split()
+)
+
+
+def _get_tokenizer():
+    global _tokenizer
+
+    if _tokenizer is None and PROMPT_TOKENIZER:
+        with _tokenizer_lock:
+            if _tokenizer is None:
+                from transformers import AutoTokenizer
+
+                _tokenizer = AutoTokenizer.from_pretrained(PROMPT_TOKENIZER)
+
+    return _tokenizer
+
+
+def count_tokens(text: str) -> int:
+    tokenizer = _get_tokenizer()
+    if tokenizer is not None:
+        return len(tokenizer.encode(text, add_special_tokens=False))
+
+    # BPE vocabularies keep common words whole and split long ones,
+    # roughly one token per four characters
+    return sum((len(word) + 3) // 4 for word in _WORD.findall(text))
+
+
+def truncate_to_tokens(text: str, budget: int) -> str:
+    if budget <= 0:
+        return ""
+
+    tokenizer = _get_tokenizer()
+    if tokenizer is not None:
+        ids = tokenizer.encode(text, add_special_tokens=False)
+        return text if len(ids) <= budget else tokenizer.decode(ids[:budget]).strip()
+
+    used = 0
+    for match in _WORD.finditer(text):
+        cost = (len(match.group()) + 3) // 4
+        if used + cost > budget:
+            # Keep whatever part of the word still fits, four characters a token
+            return text[:match.start() + (budget - used) * 4].rstrip()
+        used += cost
+
+    return text
+
+
+def _terms(text: str) -> set:
+    return {t for t in _TERM.findall(text.lower()) if t not in _STOPWORDS}
+
+
+def compact_text(text: str, budget: int, query: str = "") -> str:
+    """
+    Fits text into `budget` tokens: unchanged if it fits, otherwise the
+    sentences sharing the most terms with `query` (ties: earlier first),
+    kept in their original order.
+    """
+
+    text = text.strip()
+    if count_tokens(text) <= budget:
+        return text
+
+    sentences = [s.strip() for s in _SENTENCE_END.split(text) if s.strip()]
+    query_terms = _terms(query)
+
+    def relevance(index: int) -> tuple:
+        overlap = len(_terms(sentences[index]) & query_terms)
+        # The opening sentence usually states the answer's point
+        return (overlap + (0.5 if index == 0 else 0.0), -index)
+
+    separator_tokens = count_tokens(OMISSION)
+    marker = OMISSION.strip()
+
+    # Every kept sentence may need an omission mark before it, plus one at the end
+    remaining = budget - separator_tokens
+    chosen = {}
+
+    for index in sorted(range(len(sentences)), key=relevance, reverse=True):
+        cost = count_tokens(sentences[index]) + separator_tokens
+        if cost <= remaining:
+            chosen[index] = sentences[index]
+            remaining -= cost
+        elif remaining - separator_tokens >= MIN_FRAGMENT_TOKENS:
+            # The most relevant sentence that doesn't fit keeps its beginning
+            chosen[index] = truncate_to_tokens(sentences[index], remaining - separator_tokens) + OMISSION.rstrip()
+            break
+
+    if not chosen:
+        best = max(range(len(sentences)), key=relevance)
+        return truncate_to_tokens(sentences[best], budget - separator_tokens) + OMISSION.rstrip()
+
+    compacted = ""
+    previous = -1
+    for index in sorted(chosen):
+        if index > previous + 1 and not compacted.endswith(marker):
+            compacted += OMISSION if compacted else OMISSION.lstrip()
+        elif compacted:
+            compacted += " "
+        compacted += chosen[index]
+        previous = index
+
+    if previous < len(sentences) - 1 and not compacted.endswith(marker):
+        compacted += OMISSION.rstrip()
+
+    return compacted
+
+
+def allocate_budget(sizes: list, total: int) -> list:
+    """
+    Splits `total` tokens across parts needing `sizes` tokens: parts smaller
+    than an equal share keep everything, the rest split what they leave.
+    """
+
+    shares = [0] * len(sizes)
+    remaining = max(total, 0)
+    pending = sorted(range(len(sizes)), key=lambda i: sizes[i])
+
+    while pending:
+        equal_share = remaining // len(pending)
+        index = pending.pop(0)
+        shares[index] = min(sizes[index], equal_share)
+        remaining -= shares[index]
+
+    return shares
+
+
+def fit_prompt(name: str, render, parts: list, queries: list, budget: int) -> str:
+    """
+    render(parts) builds the prompt from its variable parts. Parts are
+    compacted against their query (the question they answer) until the
+    rendered prompt fits `budget`; the token count is reported either way.
+    """
+
+    prompt = render(parts)
+    tokens = count_tokens(prompt)
+    compacted = tokens > budget
+
+    if compacted:
+        fixed = count_tokens(render([""] * len(parts)))
+        sizes = [count_tokens(part) for part in parts]
+        available = budget - fixed
+
+        # Separate counts and the joined prompt can disagree by a few tokens
+        for _ in range(3):
+            shares = allocate_budget(sizes, available)
+            prompt = render([
+                compact_text(part, share, query)
+                for part, share, query in zip(parts, shares, queries)
+            ])
+            tokens = count_tokens(prompt)
+            if tokens <= budget:
+                break
+            available -= tokens - budget
+
+        logger.debug("%s prompt compacted to %d tokens (budget %d)", name, tokens, budget)
+
+    record_prompt_tokens(name, tokens, compacted)
+    return prompt
@@ -1,8 +1,24 @@
+from app.utils.prompt_budget import FOLLOWUP_PROMPT_TOKEN_BUDGET, QUESTION_TOKEN_CAP, compact_text, fit_prompt
+
+
 def build_followup_prompt(
     interview_type: str,
     main_question: str,
-    candidate_answer: str
+    candidate_answer: str,
+    budget: int = FOLLOWUP_PROMPT_TOKEN_BUDGET
 ) -> str:
+    main_question = compact_text(main_question, QUESTION_TOKEN_CAP)
+
+    return fit_prompt(
+        "followup",
+        lambda fitted: _render_followup_prompt(interview_type, main_question, fitted[0]),
+        [candidate_answer],
+        [main_question],
+        budget
+    )
+
+
+def _render_followup_prompt(interview_type: str, main_question: str, candidate_answer: str) -> str:
     if interview_type.lower() == "technical":
         role = "a technical interviewer"
         focus = "Ask a follow-up that digs deeper into technical details, implementation, trade-offs, or clarifications."
@@ -35,15 +51,9 @@ Rules:
     return prompt.strip()
 
 
-def build_interview_prompt(
-    interview_type: str,
-    resume_chunks: list
-) -> str:
-    context = "\n\n".join(
-        f"- {chunk['content']}"
-        for chunk in resume_chunks
-    )
-
+def _interviewer(interview_type: str, many: bool = False):
+    # (role, focus) shared by the single-question and question-bank prompts;
+    # many=True words the focus for a batch of questions
     if interview_type.lower() == "technical":
         role = "a technical interviewer"
         focus = "Ask about technical skills, programming languages, frameworks, system design, coding problems, or technical projects mentioned in the resume."
@@ -52,23 +62,76 @@ def build_interview_prompt(
         focus = "Ask about soft skills, experience, work style, teamwork, challenges overcome, or career goals. Make it conversational and natural."
     else:  # aptitude
         role = "an aptitude test interviewer"
-        focus = "Ask a logical reasoning, problem-solving, or analytical question. You can reference the resume but keep the question general and focused on reasoning skills."
+        if many:
+            focus = "Ask logical reasoning, problem-solving, or analytical questions. You can reference the resume but keep the questions general and focused on reasoning skills."
+        else:
+            focus = "Ask a logical reasoning, problem-solving, or analytical question. You can reference the resume but keep the question general and focused on reasoning skills."
+
+    return role, focus
+
+
+def _resume_context(resume_chunks: list) -> str:
+    return "\n\n".join(
+        f"- {chunk['content']}"
+        for chunk in resume_chunks
+    )
+
+
+# How every MAIN question should read, however many are asked at once
+_QUESTION_STYLE_RULES = """- Do NOT mention 'Here is a question from resume'
+- Do NOT give answers
+- Be conversational and direct
+- Ask naturally like you're speaking to the candidate
+- Do NOT say 'Based on your resume' - just ask the question naturally"""
+
+
+def build_interview_prompt(
+    interview_type: str,
+    resume_chunks: list
+) -> str:
+    role, focus = _interviewer(interview_type)
 
     prompt = f"""
 You are {role}.
 
 Resume Context:
-{context}
+{_resume_context(resume_chunks)}
 
 {focus}
 
 Rules:
 - Ask only ONE natural interview question
-- Do NOT mention 'Here is a question from resume'
-- Do NOT give answers
-- Be conversational and direct
-- Ask naturally like you're speaking to the candidate
-- Do NOT say 'Based on your resume' - just ask the question naturally
+{_QUESTION_STYLE_RULES}
+"""
+
+    return prompt.strip()
+
+
+def build_question_bank_prompt(
+    interview_type: str,
+    resume_chunks: list,
+    count: int
+) -> str:
+    role, focus = _interviewer(interview_type, many=True)
+
+    prompt = f"""
+You are {role}.
+
+Resume Context:
+{_resume_context(resume_chunks)}
+
+{focus}
+
+Write {count} different interview questions and return them STRICTLY in JSON with this format:
+
+{{
+  "questions": [list of {count} strings]
+}}
+
+Rules:
+- Each question must stand on its own and cover a different topic
+{_QUESTION_STYLE_RULES}
+- Do NOT include explanations outside JSON
 """
 
     return prompt.strip()
@@ -0,0 +1,146 @@
+import logging
+import os
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models.question_bank import QuestionBankEntry
+from app.utils.groq_client import generate_with_groq
+from app.utils.llm_json import parse_json_response
+from app.utils.prefetch import Prefetcher
+from app.utils.prompt_builder import build_question_bank_prompt
+from app.utils.retrieval import get_interview_chunks
+
+# Serve MAIN questions from a per-resume bank instead of one LLM call each
+QUESTION_BANK_ENABLED = os.getenv("QUESTION_BANK_ENABLED", "0") == "1"
+QUESTION_BANK_SIZE = int(os.getenv("QUESTION_BANK_SIZE", "10"))
+QUESTION_BANK_MAX_TOKENS = int(os.getenv("QUESTION_BANK_MAX_TOKENS", "1200"))
+QUESTION_BANK_WORKERS = int(os.getenv("QUESTION_BANK_WORKERS", "2"))
+
+bank_jobs = Prefetcher(max_workers=QUESTION_BANK_WORKERS)
+
+logger = logging.getLogger(__name__)
+
+
+def _unused(db: Session, resume_id: int, interview_type: str):
+    return db.query(QuestionBankEntry).filter(
+        QuestionBankEntry.resume_id == resume_id,
+        QuestionBankEntry.interview_type == interview_type.lower(),
+        QuestionBankEntry.used_by_session_id.is_(None)
+    )
+
+
+def has_unused_question(db: Session, resume_id: int, interview_type: str) -> bool:
+    return _unused(db, resume_id, interview_type).with_entities(QuestionBankEntry.id).first() is not None
+
+
+def claim_bank_question(db: Session, resume_id: int, interview_type: str, session_id: int):
+    """
+    Marks the next unused question as used by session_id, inside the caller's
+    transaction. Returns (question or None, whether the bank is now empty).
+    """
+
+    while True:
+        candidates = (
+            _unused(db, resume_id, interview_type)
+            .with_entities(QuestionBankEntry.id, QuestionBankEntry.question)
+            .order_by(QuestionBankEntry.generation, QuestionBankEntry.position)
+            .limit(2)
+            .all()
+        )
+
+        if not candidates:
+            return None, True
+
+        # Conditional update: a concurrent claim of the same row matches nothing
+        claimed = db.query(QuestionBankEntry).filter(
+            QuestionBankEntry.id == candidates[0].id,
+            QuestionBankEntry.used_by_session_id.is_(None)
+        ).update({QuestionBankEntry.used_by_session_id: session_id}, synchronize_session=False)
+
+        if claimed:
+            return candidates[0].question, len(candidates) == 1
+
+
+def generate_question_bank(db: Session, resume_id: int, interview_type: str, count: int = QUESTION_BANK_SIZE) -> list:
+    # RAG retrieval (precomputed at upload for known interview types)
+    resume_chunks = get_interview_chunks(
+        db=db,
+        resume_id=resume_id,
+        interview_type=interview_type
+    )
+    db.commit()  # don't hold a connection across the LLM call
+
+    prompt = build_question_bank_prompt(
+        interview_type=interview_type,
+        resume_chunks=resume_chunks,
+        count=count
+    )
+
+    reply = parse_json_response(
+        generate_with_groq(prompt, max_tokens=QUESTION_BANK_MAX_TOKENS)
+    )
+    if not isinstance(reply, dict):
+        raise ValueError(f"Question bank reply is a JSON {type(reply).__name__}, not an object")
+
+    questions = reply.get("questions", [])
+    if not isinstance(questions, list):
+        raise ValueError("Question bank reply has no list of questions")
+
+    return [q.strip() for q in questions if isinstance(q, str) and q.strip()][:count]
+
+
+def _refill_bank(resume_id: int, interview_type: str, cancelled):
+    db = SessionLocal()
+    try:
+        if has_unused_question(db, resume_id, interview_type):
+            return
+
+        questions = generate_question_bank(db, resume_id, interview_type)
+
+        if cancelled.is_set():
+            return
+        if not questions:
+            logger.warning("Question bank reply for resume %s (%s) had no questions", resume_id, interview_type)
+            return
+
+        generation = (db.query(func.max(QuestionBankEntry.generation)).filter(
+            QuestionBankEntry.resume_id == resume_id,
+            QuestionBankEntry.interview_type == interview_type.lower()
+        ).scalar() or 0) + 1
+
+        db.add_all([
+            QuestionBankEntry(
+                resume_id=resume_id,
+                interview_type=interview_type.lower(),
+                generation=generation,
+                position=position,
+                question=question
+            )
+            for position, question in enumerate(questions)
+        ])
+        db.commit()
+    except IntegrityError:
+        # Another worker stored this generation first
+        db.rollback()
+    except Exception:
+        # LLM/network failure or unparseable reply; questions are generated
+        # live until the next refill
+        logger.exception("Question bank refill failed for resume %s (%s)", resume_id, interview_type)
+        db.rollback()
+    finally:
+        db.close()
+
+
+def schedule_bank_refill(resume_id: int, interview_type: str):
+    """
+    Fills the bank in the background if it has no unused questions left.
+    """
+
+    if QUESTION_BANK_ENABLED:
+        bank_jobs.schedule(
+            (resume_id, interview_type.lower()),
+            lambda cancelled: _refill_bank(resume_id, interview_type, cancelled)
+        )
@@ -0,0 +1,74 @@
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.models.resume_chunk import ResumeChunk
+from app.models.resume_retrieval import ResumeRetrieval
+from app.utils.vector_search import embed_query, search_resume_chunks, top_k_indices
+
+# Interview types offered by the frontend; their retrievals are precomputed per resume
+INTERVIEW_TYPES = ("Technical", "HR", "Aptitude")
+RETRIEVAL_TOP_K = 3
+
+
+def materialize_interview_retrievals(
+    db: Session,
+    resume_id: int,
+    chunk_ids: list,
+    embeddings: np.ndarray,
+    top_k: int = RETRIEVAL_TOP_K
+):
+    """
+    Stores the top-k chunk ids for every known interview type.
+    Caller commits.
+    """
+
+    if not chunk_ids:
+        return
+
+    for interview_type in INTERVIEW_TYPES:
+        scores = embeddings @ embed_query(interview_type)
+        best = top_k_indices(scores, top_k)
+
+        db.add(ResumeRetrieval(
+            resume_id=resume_id,
+            interview_type=interview_type.lower(),
+            chunk_ids=[int(chunk_ids[i]) for i in best],
+            scores=[float(scores[i]) for i in best]
+        ))
+
+
+def get_interview_chunks(
+    db: Session,
+    resume_id: int,
+    interview_type: str,
+    top_k: int = RETRIEVAL_TOP_K
+):
+    materialized = db.query(ResumeRetrieval).filter(
+        ResumeRetrieval.resume_id == resume_id,
+        ResumeRetrieval.interview_type == interview_type.lower()
+    ).first()
+
+    # Unknown type, resume uploaded before materialization, or deeper than stored
+    if materialized is None or top_k > RETRIEVAL_TOP_K:
+        return search_resume_chunks(
+            db=db,
+            resume_id=resume_id,
+            query=interview_type,
+            top_k=top_k
+        )
+
+    chunk_ids = materialized.chunk_ids[:top_k]
+    content_by_id = dict(
+        db.query(ResumeChunk.id, ResumeChunk.content)
+        .filter(ResumeChunk.id.in_(chunk_ids))
+        .all()
+    )
+
+    return [
+        {
+            "content": content_by_id[chunk_id],
+            "score": score
+        }
+        for chunk_id, score in zip(chunk_ids, materialized.scores)
+        if chunk_id in content_by_id
+    ]
@@ -0,0 +1,112 @@
+import os
+from dataclasses import dataclass, replace
+
+from sqlalchemy.orm import Session
+
+from app.models.interview_session import InterviewSession
+from app.models.interview_turn import InterviewTurn
+from app.utils.ttl_cache import TTLCache
+
+SESSION_STATE_TTL_SECONDS = float(os.getenv("SESSION_STATE_TTL_SECONDS", "1800"))
+SESSION_STATE_MAX_ENTRIES = int(os.getenv("SESSION_STATE_MAX_ENTRIES", "10000"))
+
+session_states = TTLCache(ttl_seconds=SESSION_STATE_TTL_SECONDS, max_entries=SESSION_STATE_MAX_ENTRIES)
+
+
+@dataclass(frozen=True)
+class SessionState:
+    """
+    Where an interview stands. Cached per process and written through to
+    interview_sessions; every change bumps `version`, and a write from a
+    stale copy (e.g. cached by another worker) matches no row.
+    """
+
+    session_id: int
+    user_id: int
+    resume_id: int
+    interview_type: str
+    main_question_count: int
+    status: str
+    current_turn_id: int | None
+    current_question: str | None
+    has_follow_up: bool
+    version: int
+
+    @property
+    def completed(self) -> bool:
+        return self.main_question_count >= 5
+
+    @classmethod
+    def from_row(cls, session: InterviewSession, current_question: str | None = None):
+        return cls(
+            session_id=session.id,
+            user_id=session.user_id,
+            resume_id=session.resume_id,
+            interview_type=session.interview_type,
+            main_question_count=session.main_question_count or 0,
+            status=session.status or "active",
+            current_turn_id=session.current_turn_id,
+            current_question=current_question,
+            has_follow_up=bool(session.current_has_follow_up),
+            version=session.state_version or 0
+        )
+
+
+_COLUMNS = {
+    "main_question_count": InterviewSession.main_question_count,
+    "status": InterviewSession.status,
+    "current_turn_id": InterviewSession.current_turn_id,
+    "has_follow_up": InterviewSession.current_has_follow_up,
+}
+
+
+def load_session_state(db: Session, session_id: int, use_cache: bool = True) -> SessionState | None:
+    if use_cache:
+        cached = session_states.get(session_id)
+        if cached is not None:
+            return cached
+
+    # One round trip: the session row plus the text of its current question
+    row = (
+        db.query(InterviewSession, InterviewTurn.question)
+        .outerjoin(InterviewTurn, InterviewTurn.id == InterviewSession.current_turn_id)
+        .filter(InterviewSession.id == session_id)
+        .first()
+    )
+
+    if row is None:
+        return None
+
+    state = SessionState.from_row(row[0], row[1])
+    session_states.set(session_id, state)
+
+    return state
+
+
+def transition(db: Session, state: SessionState, **changes) -> SessionState | None:
+    """
+    Adds the guarded UPDATE for a state change to db's open transaction.
+    Returns the new state, or None if the row has moved past `state`.
+    Call remember_session_state() once the transaction commits.
+    """
+
+    values = {_COLUMNS[name]: value for name, value in changes.items() if name in _COLUMNS}
+    values[InterviewSession.state_version] = state.version + 1
+
+    updated = db.query(InterviewSession).filter(
+        InterviewSession.id == state.session_id,
+        InterviewSession.state_version == state.version
+    ).update(values, synchronize_session=False)
+
+    if not updated:
+        return None
+
+    return replace(state, version=state.version + 1, **changes)
+
+
+def remember_session_state(state: SessionState):
+    session_states.set(state.session_id, state)
+
+
+def forget_session_state(session_id: int):
+    session_states.invalidate(session_id)
@@ -0,0 +1,23 @@
+import asyncio
+
+
+class AsyncSingleFlight:
+    """
+    Coalesces concurrent calls for the same key on one event loop: the first
+    caller runs fn, everyone else waiting on that key awaits the leader's
+    task and gets its result (or exception).
+    """
+
+    def __init__(self):
+        self._calls = {}
+
+    async def do(self, key, fn):
+        task = self._calls.get(key)
+
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+
+        # shield: one caller disconnecting must not cancel the shared call
+        return await asyncio.shield(task)
@@ -1,3 +1,5 @@
+import re
+from bisect import bisect_left, bisect_right
 from typing import List
 
 def chunk_text(
@@ -25,3 +27,112 @@ def chunk_text(
         start = end - overlap  # overlap helps retain context
 
     return chunks
+
+def iter_chunks(
+    pieces,
+    chunk_size: int = 1000,
+    overlap: int = 100
+):
+    """
+    Streaming chunk_text: consumes text pieces as they arrive and yields
+    the same chunks chunk_text would for their concatenation.
+    """
+
+    buffer = ""
+
+    for piece in pieces:
+        buffer += piece
+
+        while len(buffer) >= chunk_size:
+            yield buffer[:chunk_size].strip()
+            buffer = buffer[chunk_size - overlap:]  # overlap helps retain context
+
+    # Same tail as chunk_text: keep stepping until a window starts past the end
+    while buffer:
+        yield buffer[:chunk_size].strip()
+        buffer = buffer[chunk_size - overlap:]
+
+# Chunks end after sentence punctuation or at a line break when possible
+_BOUNDARY = re.compile(r"\n|(?<=[.!?;])\s+")
+
+def _token_offsets(text: str, tokenizer) -> list:
+    encoding = tokenizer(
+        text,
+        add_special_tokens=False,
+        return_offsets_mapping=True,
+        verbose=False
+    )
+    return encoding["offset_mapping"]
+
+def _plan_token_chunks(text: str, offsets: list, max_tokens: int, final: bool):
+    """
+    Packs whole sentences/lines into windows of at most max_tokens tokens.
+    Returns (chunks, consumed_chars). Unless final, the trailing partial
+    window is left unconsumed so more text can extend it.
+    """
+
+    token_starts = [start for start, _ in offsets]
+    boundaries = sorted({
+        bisect_left(token_starts, match.end())
+        for match in _BOUNDARY.finditer(text)
+    })
+
+    chunks = []
+    i = 0
+    n = len(offsets)
+
+    while i < n:
+        if n - i <= max_tokens:
+            if not final:
+                break
+            j = n
+        else:
+            limit = i + max_tokens
+            k = bisect_right(boundaries, limit) - 1
+            # No boundary inside the window: hard cut at the token limit
+            j = boundaries[k] if k >= 0 and boundaries[k] > i else limit
+
+        chunk = text[offsets[i][0]:offsets[j - 1][1]].strip()
+        if chunk:
+            chunks.append(chunk)
+        i = j
+
+    consumed = offsets[i][0] if i < n else len(text)
+    return chunks, consumed
+
+def iter_token_chunks(
+    pieces,
+    tokenizer,
+    max_tokens: int
+):
+    """
+    Splits streamed text into chunks that fit the embedding model window.
+    Each piece is tokenized once (plus the carried-over partial window)
+    and chunk text is sliced straight from the token offsets.
+    """
+
+    buffer = ""
+
+    for piece in pieces:
+        buffer += piece
+        chunks, consumed = _plan_token_chunks(
+            buffer, _token_offsets(buffer, tokenizer), max_tokens, final=False
+        )
+        yield from chunks
+        buffer = buffer[consumed:]
+
+    if buffer.strip():
+        chunks, _ = _plan_token_chunks(
+            buffer, _token_offsets(buffer, tokenizer), max_tokens, final=True
+        )
+        yield from chunks
+
+def chunk_text_by_tokens(
+    text: str,
+    tokenizer,
+    max_tokens: int
+) -> List[str]:
+    if not text:
+        return []
+
+    return list(iter_token_chunks([text], tokenizer, max_tokens))
@@ -1,9 +1,6 @@
 import re
 
-def clean_resume_text(text: str) -> str:
-    if not text:
-        return ""
-
+def _clean(text: str) -> str:
     # 1. Remove extra spaces
     text = re.sub(r'[ \t]+', ' ', text)
 
@@ -18,7 +15,53 @@ def clean_resume_text(text: str) -> str:
     text = text.replace("–", "")
     text = text.replace("●", "")
 
+    return text
+
+def clean_resume_text(text: str) -> str:
+    if not text:
+        return ""
+
     # 5. Remove leading/trailing spaces
-    text = text.strip()
+    return _clean(text).strip()
 
-    return text
+def iter_clean_pages(pages):
+    """
+    Cleans page texts one at a time, each with the same rules as
+    clean_resume_text. Only newline runs are collapsed across page
+    boundaries; a space run or a "Page N" marker split between two pages
+    is cleaned per page, so the joined output can differ slightly from
+    cleaning the whole document at once.
+    """
+
+    at_line_start = True
+
+    for page in pages:
+        cleaned = _clean(page)
+
+        # Line breaks are collapsed across page boundaries too
+        if at_line_start:
+            cleaned = cleaned.lstrip("\n")
+
+        if not cleaned:
+            continue
+
+        at_line_start = cleaned.endswith("\n")
+        yield cleaned
+
+# Same rules as _clean in one scan: space runs, newline runs, page
+# numbers and bullet symbols are matched by a single alternation
+_CLEAN_PATTERN = re.compile(r"[ \t]+|\n+|Page\s+\d+|[•–●]", flags=re.IGNORECASE)
+
+def _clean_match(match) -> str:
+    first = match.group()[0]
+    if first in " \t":
+        return " "
+    if first == "\n":
+        return "\n"
+    return ""
+
+def clean_resume_text_compiled(text: str) -> str:
+    if not text:
+        return ""
+
+    return _CLEAN_PATTERN.sub(_clean_match, text).strip()
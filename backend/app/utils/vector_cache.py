@@ -0,0 +1,81 @@
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# Upper bound on cached matrix + chunk text bytes per worker
+VECTOR_CACHE_MAX_BYTES = int(os.getenv("VECTOR_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+
+class ResumeVectors:
+    def __init__(self, chunk_ids: list, contents: list, matrix: np.ndarray):
+        self.chunk_ids = chunk_ids
+        self.contents = contents
+        self.matrix = matrix
+        self.nbytes = matrix.nbytes + sum(len(c) for c in contents)
+
+
+class ResumeVectorCache:
+    """
+    LRU of per-resume embedding matrices, evicted by total size rather than count.
+    """
+
+    def __init__(self, max_bytes: int = VECTOR_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, resume_id: int):
+        with self._lock:
+            entry = self._entries.get(resume_id)
+            if entry is not None:
+                self._entries.move_to_end(resume_id)
+            return entry
+
+    def put(self, resume_id: int, entry: ResumeVectors):
+        if entry.nbytes > self.max_bytes:
+            return
+
+        with self._lock:
+            old = self._entries.pop(resume_id, None)
+            if old is not None:
+                self.total_bytes -= old.nbytes
+
+            self._entries[resume_id] = entry
+            self.total_bytes += entry.nbytes
+
+            while self.total_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.total_bytes -= evicted.nbytes
+
+    def invalidate(self, resume_id: int):
+        with self._lock:
+            old = self._entries.pop(resume_id, None)
+            if old is not None:
+                self.total_bytes -= old.nbytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+
+resume_vector_cache = ResumeVectorCache()
+
+
+def build_resume_vectors(chunk_ids: list, contents: list, matrix: np.ndarray) -> ResumeVectors:
+    # Re-normalize defensively (int8/float16 storage drifts slightly) and
+    # keep one contiguous float32 block for the dot product
+    matrix = np.array(matrix, dtype=np.float32, order="C")
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    matrix /= norms
+    matrix.setflags(write=False)
+
+    return ResumeVectors(chunk_ids, contents, matrix)
+
+
+def invalidate_resume(resume_id: int):
+    resume_vector_cache.invalidate(resume_id)
@@ -1,9 +1,53 @@
+from functools import lru_cache
+
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
 from sqlalchemy.orm import Session
 
 from app.models.resume_chunk import ResumeChunk
 from app.utils.embedding import embed_text
+from app.utils.embedding_codec import decode_embedding_matrix
+from app.utils.vector_cache import resume_vector_cache, build_resume_vectors
+from app.utils.metrics import stage_timer
+
+
+@lru_cache(maxsize=256)
+def embed_query(query: str) -> np.ndarray:
+    # Repeated queries (interview types, popular searches) skip the model
+    embedding = np.asarray(embed_text(query), dtype=np.float32)
+    embedding.setflags(write=False)
+    return embedding
+
+
+def load_resume_vectors(db: Session, resume_id: int):
+    cached = resume_vector_cache.get(resume_id)
+    if cached is not None:
+        return cached
+
+    # Fetch chunks for this resume
+    chunks = db.query(ResumeChunk).filter(
+        ResumeChunk.resume_id == resume_id
+    ).order_by(ResumeChunk.id).all()
+
+    if not chunks:
+        return None
+
+    entry = build_resume_vectors(
+        chunk_ids=[c.id for c in chunks],
+        contents=[c.content for c in chunks],
+        matrix=decode_embedding_matrix(chunks)
+    )
+    resume_vector_cache.put(resume_id, entry)
+
+    return entry
+
+
+def top_k_indices(scores: np.ndarray, top_k: int) -> np.ndarray:
+    if top_k >= len(scores):
+        return np.argsort(-scores)
+
+    # O(n) selection, then sort only the k winners
+    candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+    return candidates[np.argsort(-scores[candidates])]
 
 
 def search_resume_chunks(
@@ -12,36 +56,23 @@ def search_resume_chunks(
     query: str,
     top_k: int = 3
 ):
-    # Embed the query
-    query_embedding = embed_text(query)
-
-    # Fetch chunks for this resume
-    chunks = db.query(ResumeChunk).filter(
-        ResumeChunk.resume_id == resume_id
-    ).all()
+    vectors = load_resume_vectors(db, resume_id)
 
-    if not chunks:
+    if vectors is None:
         return []
 
-    # Prepare vectors
-    chunk_embeddings = np.array([c.embedding for c in chunks])
-    query_embedding = query_embedding.reshape(1, -1)
-
-    # Compute similarity
-    similarities = cosine_similarity(query_embedding, chunk_embeddings)[0]
+    # Embeddings are normalized, so cosine similarity is a dot product
+    query_embedding = embed_query(query)
 
-    # Rank chunks
-    ranked_chunks = sorted(
-        zip(chunks, similarities),
-        key=lambda x: x[1],
-        reverse=True
-    )
+    with stage_timer("vector_search"):
+        similarities = vectors.matrix @ query_embedding
+        best = top_k_indices(similarities, top_k)
 
     # Return top K chunks
     return [
         {
-            "content": chunk.content,
-            "score": float(score)
+            "content": vectors.contents[i],
+            "score": float(similarities[i])
         }
-        for chunk, score in ranked_chunks[:top_k]
+        for i in best
     ]
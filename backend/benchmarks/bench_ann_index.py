@@ -0,0 +1,82 @@
+"""
+Query latency and recall of the cross-resume ANN index against exact search.
+
+Builds an index over synthetic clustered vectors in a temporary directory, so
+it only needs NumPy. Run from backend/:
+    python -m benchmarks.bench_ann_index --chunks 1000000 --nprobe 16
+"""
+import argparse
+import math
+import tempfile
+import time
+
+import numpy as np
+
+from app.utils.ann_index import AnnIndex, train_centroids
+
+
+def clustered_vectors(n, dim, topics, seed=0):
+    # Resume chunks cluster around topics; uniform noise would defeat any IVF
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((topics, dim)).astype(np.float32)
+    vectors = centers[rng.integers(0, topics, n)] + 0.6 * rng.standard_normal((n, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunks", type=int, default=200000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--chunks-per-resume", type=int, default=20)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--nprobe", type=int, default=16)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--top-k", type=int, default=10)
+    args = parser.parse_args()
+
+    vectors = clustered_vectors(args.chunks, args.dim, topics=max(16, args.chunks // 1000))
+    resume_ids = np.arange(args.chunks) // args.chunks_per_resume
+    user_ids = resume_ids % args.users
+
+    with tempfile.TemporaryDirectory() as directory:
+        index = AnnIndex(directory)
+
+        start = time.perf_counter()
+        centroids = train_centroids(vectors[:100000], int(4 * math.sqrt(args.chunks)))
+        index.write_generation(0, centroids)
+        with index.file_lock():
+            index.append(0, centroids, np.arange(args.chunks), resume_ids, user_ids, vectors)
+            index.publish(0, args.dim, len(centroids))
+        index.refresh()
+        print(f"chunks={args.chunks} lists={len(centroids)} build={time.perf_counter() - start:.1f}s")
+
+        rng = np.random.default_rng(1)
+        queries = vectors[rng.integers(0, args.chunks, args.queries)]
+        queries = queries + 0.05 * rng.standard_normal(queries.shape).astype(np.float32)
+
+        for label, user_id in (("all users", None), ("one user", 0)):
+            timings, recalls = [], []
+
+            for query in queries:
+                start = time.perf_counter()
+                hits = index.search(query, top_k=args.top_k, user_id=user_id, nprobe=args.nprobe)
+                timings.append(time.perf_counter() - start)
+
+                # Exact top resumes by best chunk score, for recall
+                mask = slice(None) if user_id is None else user_ids == user_id
+                scores = vectors[mask] @ (query / np.linalg.norm(query))
+                best = np.full(resume_ids[-1] + 1, -np.inf, dtype=np.float32)
+                np.maximum.at(best, resume_ids[mask], scores)
+                exact = set(np.argsort(-best)[:args.top_k].tolist())
+                recalls.append(len(exact & {h["resume_id"] for h in hits}) / max(len(exact), 1))
+
+            timings.sort()
+            print(
+                f"{label:<10} p50={timings[len(timings) // 2] * 1000:.2f}ms "
+                f"p95={timings[int(len(timings) * 0.95)] * 1000:.2f}ms "
+                f"recall@{args.top_k}={np.mean(recalls):.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Chunks/sec for resume ingestion: per-chunk embed_text loop vs batched embed_texts.
+
+Run from backend/:
+    python -m benchmarks.bench_chunk_embedding --pages 10 --batch-size 32
+"""
+import argparse
+
+from app.utils.embedding import embed_text, embed_texts
+from app.utils.text_chunker import chunk_text
+from app.utils.text_cleaner import clean_resume_text
+from benchmarks.synthetic import synthetic_resume_text
+from benchmarks.timing import best_of
+
+
+def per_chunk(chunks):
+    return [embed_text(chunk) for chunk in chunks]
+
+
+def batched(chunks, batch_size):
+    return embed_texts(chunks, batch_size=batch_size)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    chunks = chunk_text(clean_resume_text(synthetic_resume_text(args.pages)))
+
+    # Warm up the model so the first timed run isn't paying for lazy init
+    embed_texts(chunks[:2])
+
+    _, before = best_of(lambda: per_chunk(chunks), args.repeats)
+    _, after = best_of(lambda: batched(chunks, args.batch_size), args.repeats)
+
+    print(f"pages={args.pages} chunks={len(chunks)} batch_size={args.batch_size}")
+    print(f"per-chunk loop : {before:.3f}s  {len(chunks) / before:8.1f} chunks/sec")
+    print(f"batched encode : {after:.3f}s  {len(chunks) / after:8.1f} chunks/sec")
+    print(f"speedup        : {before / after:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Throughput and parity of the embedding backends.
+
+Every backend embeds the same synthetic resume chunks; throughput is
+reported as texts/sec, and parity as the cosine between each backend's
+vector and the torch reference for the same text. Exits non-zero when a
+backend falls below its parity threshold, so it doubles as a check in CI.
+Peak RSS is cumulative for the process (torch loads first), so compare
+per-worker memory by running the app with each EMBEDDING_BACKEND instead.
+
+Run from backend/ after `python -m scripts.export_onnx_model --output models/minilm --quantize`:
+    python -m benchmarks.bench_embedding_backends --model-dir models/minilm
+"""
+import argparse
+import resource
+import sys
+import time
+
+import numpy as np
+
+from app.utils.embedding_backends import load_backend
+from app.utils.text_chunker import chunk_text
+from app.utils.text_cleaner import clean_resume_text
+from benchmarks.synthetic import synthetic_resume_text
+from benchmarks.timing import best_of
+
+# Minimum per-text cosine agreement with the torch reference
+PARITY_THRESHOLDS = {
+    "onnx": 0.999,
+    "onnx-int8": 0.98,
+}
+
+
+def rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model-dir", required=True)
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--threads", type=int, default=0)
+    args = parser.parse_args()
+
+    texts = chunk_text(clean_resume_text(synthetic_resume_text(args.pages)))
+    texts += [f"{t.split(',')[0]}" for t in texts]  # short, query-like inputs too
+
+    configs = [
+        ("torch", {"quantize": False}),
+        ("onnx", {"quantize": False}),
+        ("onnx", {"quantize": True}),
+    ]
+
+    reference = None
+    failed = False
+
+    print(f"texts={len(texts)} batch_size={args.batch_size}")
+    print(f"{'backend':<10} {'load s':>7} {'texts/s':>9} {'peak RSS MB':>12} {'min cos':>8} {'mean cos':>9}")
+
+    for name, options in configs:
+        start = time.perf_counter()
+        backend = load_backend(name, model_dir=args.model_dir, threads=args.threads, **options)
+        load_time = time.perf_counter() - start
+
+        backend.encode(texts[:2], batch_size=2)  # warm up
+
+        vectors, best = best_of(lambda: backend.encode(texts, batch_size=args.batch_size), args.repeats)
+
+        if reference is None:
+            reference = vectors
+
+        cosines = np.sum(vectors * reference, axis=1)
+        threshold = PARITY_THRESHOLDS.get(backend.name)
+        if threshold is not None and cosines.min() < threshold:
+            failed = True
+
+        print(
+            f"{backend.name:<10} {load_time:>7.2f} {len(texts) / best:>9.1f} {rss_mb():>12.0f} "
+            f"{cosines.min():>8.4f} {cosines.mean():>9.4f}"
+        )
+
+    if failed:
+        print("Parity check FAILED")
+        sys.exit(1)
+
+    print("Parity check passed")
+
+
+if __name__ == "__main__":
+    main()
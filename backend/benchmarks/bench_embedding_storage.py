@@ -0,0 +1,65 @@
+"""
+Decode time and storage size for ResumeChunk embeddings: JSON vs binary.
+
+Mirrors the matrix-building step of search_resume_chunks without a database,
+so it only needs NumPy. Run from backend/:
+    python -m benchmarks.bench_embedding_storage --chunks 50 --dim 384
+"""
+import argparse
+import json
+from types import SimpleNamespace
+
+import numpy as np
+
+from app.utils.embedding_codec import encode_embedding, decode_embedding_matrix
+from benchmarks.timing import best_of
+
+
+def random_unit_vectors(n, dim, seed=0):
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((n, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunks", type=int, default=50)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    vectors = random_unit_vectors(args.chunks, args.dim)
+
+    # What the driver hands back for a JSON column: text that has to be parsed
+    json_rows = [json.dumps(v.tolist()) for v in vectors]
+    json_bytes = sum(len(r) for r in json_rows)
+
+    def decode_json():
+        return np.array([json.loads(r) for r in json_rows])
+
+    _, json_time = best_of(decode_json, args.repeats)
+
+    print(f"chunks={args.chunks} dim={args.dim}")
+    print(f"{'format':<8} {'bytes/vec':>10} {'total KiB':>10} {'decode ms':>10} {'max abs err':>12}")
+    print(f"{'json':<8} {json_bytes / args.chunks:>10.0f} {json_bytes / 1024:>10.1f} {json_time * 1000:>10.3f} {0.0:>12.2e}")
+
+    for dtype in ("float32", "float16", "int8"):
+        rows = []
+        for v in vectors:
+            blob, scale = encode_embedding(v, dtype)
+            rows.append(SimpleNamespace(
+                embedding=None,
+                embedding_vector=blob,
+                embedding_dtype=dtype,
+                embedding_scale=scale
+            ))
+
+        size = sum(len(r.embedding_vector) for r in rows)
+        _, decode_time = best_of(lambda: decode_embedding_matrix(rows), args.repeats)
+        error = float(np.abs(decode_embedding_matrix(rows) - vectors).max())
+
+        print(f"{dtype:<8} {size / args.chunks:>10.0f} {size / 1024:>10.1f} {decode_time * 1000:>10.3f} {error:>12.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Offline benchmark of the resume ingestion path, stage by stage.
+
+For each synthetic PDF size it times extract → clean (original and
+compiled single-pass cleaner) → chunk → embed → DB insert into an
+in-memory SQLite database, and records the peak RSS of a fresh process.
+Results are written as JSON so runs can be diffed between commits.
+
+Run from backend/:
+    python -m benchmarks.bench_ingestion --pages 1 5 10 25 50 --output bench_results/ingestion.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+
+# Keep app.database importable without a real database
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_size(pages: int, repeats: int) -> dict:
+    # Runs in its own process so peak RSS belongs to this size alone
+    from sqlalchemy import insert
+
+    from app.database import Base, engine, SessionLocal
+    from app.models.resume_chunk import ResumeChunk
+    from app.utils.embedding import embed_texts
+    from app.utils.embedding_codec import encode_embedding, EMBEDDING_STORAGE_DTYPE
+    from app.utils.ingestion import iter_resume_chunks
+    from app.utils.pdf_extractor import iter_pdf_pages
+    from app.utils.text_cleaner import clean_resume_text, clean_resume_text_compiled
+    from benchmarks.synthetic import synthetic_resume_pdf
+    from benchmarks.timing import best_of
+
+    pdf_bytes = synthetic_resume_pdf(pages)
+    embed_texts(["warm up"])
+    rss_before = _peak_rss_mb()
+
+    stages = {}
+
+    raw_pages, stages["extract"] = best_of(lambda: list(iter_pdf_pages(pdf_bytes)), repeats)
+    raw_text = "".join(raw_pages)
+
+    cleaned, stages["clean"] = best_of(lambda: clean_resume_text(raw_text), repeats)
+    compiled, stages["clean_compiled"] = best_of(lambda: clean_resume_text_compiled(raw_text), repeats)
+
+    chunks, stages["chunk"] = best_of(lambda: list(iter_resume_chunks([cleaned])), repeats)
+    embeddings, stages["embed"] = best_of(lambda: embed_texts(chunks), repeats)
+
+    Base.metadata.create_all(bind=engine, tables=[ResumeChunk.__table__])
+
+    def insert_chunks():
+        db = SessionLocal()
+        try:
+            rows = []
+            for chunk, embedding in zip(chunks, embeddings):
+                blob, scale = encode_embedding(embedding)
+                rows.append({
+                    "resume_id": 1,
+                    "content": chunk,
+                    "embedding_vector": blob,
+                    "embedding_dtype": EMBEDDING_STORAGE_DTYPE,
+                    "embedding_scale": scale
+                })
+            # The statement upload_resume runs: one batched INSERT ... RETURNING
+            db.scalars(
+                insert(ResumeChunk).returning(ResumeChunk.id, sort_by_parameter_order=True),
+                rows
+            ).all()
+            db.commit()
+        finally:
+            db.close()
+
+    _, stages["db_insert"] = best_of(insert_chunks, repeats)
+
+    return {
+        "pages": pages,
+        "pdf_bytes": len(pdf_bytes),
+        "text_chars": len(cleaned),
+        "chunks": len(chunks),
+        "compiled_cleaner_matches": compiled == cleaned,
+        "stages_ms": {name: round(seconds * 1000, 3) for name, seconds in stages.items()},
+        "total_ms": round(sum(v for k, v in stages.items() if k != "clean_compiled") * 1000, 3),
+        "rss_after_warmup_mb": round(rss_before, 1),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            stderr=subprocess.DEVNULL,
+            text=True
+        ).strip()
+    except Exception:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 5, 10, 25, 50])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", default="bench_results/ingestion.json")
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    results = []
+
+    with context.Pool(processes=1, maxtasksperchild=1) as pool:
+        for pages in args.pages:
+            result = pool.apply(run_size, (pages, args.repeats))
+            results.append(result)
+
+            stages = "  ".join(f"{k}={v:.1f}" for k, v in result["stages_ms"].items())
+            print(f"pages={pages:<3} chunks={result['chunks']:<4} peak_rss={result['peak_rss_mb']:.0f}MB  {stages}")
+
+    report = {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "repeats": args.repeats,
+        "results": results,
+    }
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Concurrent full interviews (start → 5 × question/answer → feedback) against
+one or more running servers, to compare sync and async database modes.
+
+Point every server at benchmarks.fake_groq so LLM latency is fixed, e.g.
+the previous (sync) revision in a git worktree on :8001 and this one on :8002.
+Run from backend/:
+    python -m benchmarks.bench_interview_load \\
+        --target sync=http://127.0.0.1:8001 --target async=http://127.0.0.1:8002 \\
+        --sessions 200
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+from benchmarks.synthetic import synthetic_resume_pdf
+
+EMAIL = "bench-interview-load@example.com"
+PASSWORD = "bench-password"
+STEPS = ("start", "question", "answer", "feedback")
+
+
+async def setup(client):
+    await client.post("/auth/signup", json={"email": EMAIL, "password": PASSWORD})
+    token = (await client.post(
+        "/auth/login",
+        data={"username": EMAIL, "password": PASSWORD}
+    )).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    upload = await client.post(
+        "/resume/upload",
+        files={"file": ("bench.pdf", synthetic_resume_pdf(pages=2), "application/pdf")},
+        headers=headers
+    )
+    upload.raise_for_status()
+
+    return headers, upload.json()["resume_id"]
+
+
+async def timed(latencies, step, request):
+    start = time.perf_counter()
+    response = await request
+    latencies[step].append(time.perf_counter() - start)
+    response.raise_for_status()
+    return response.json()
+
+
+async def interview(client, headers, resume_id, latencies):
+    session = await timed(latencies, "start", client.post(
+        "/interview-session/start",
+        json={"resume_id": resume_id, "interview_type": "Technical"},
+        headers=headers
+    ))
+    session_id = session["session_id"]
+
+    for _ in range(5):
+        await timed(latencies, "question", client.post(
+            "/interview/question",
+            params={"session_id": session_id, "interview_type": "Technical", "resume_id": resume_id},
+            headers=headers
+        ))
+        await timed(latencies, "answer", client.post(
+            "/interview/answer",
+            json={"session_id": session_id, "answer": "I split the service by read and write paths."},
+            headers=headers
+        ))
+
+    await timed(latencies, "feedback", client.post(
+        "/interview/feedback",
+        params={"session_id": session_id},
+        headers=headers
+    ))
+
+
+async def run_target(base_url, sessions):
+    latencies = {step: [] for step in STEPS}
+    limits = httpx.Limits(max_connections=sessions + 10)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=300) as client:
+        headers, resume_id = await setup(client)
+
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(interview(client, headers, resume_id, latencies) for _ in range(sessions)),
+            return_exceptions=True
+        )
+        elapsed = time.perf_counter() - start
+
+    failures = sum(isinstance(r, Exception) for r in results)
+    return latencies, elapsed, failures
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[max(0, int(len(ordered) * fraction) - 1)]
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--target", action="append", required=True, help="label=base_url")
+    parser.add_argument("--sessions", type=int, default=100, help="Concurrent interviews per target")
+    args = parser.parse_args()
+
+    for target in args.target:
+        label, base_url = target.split("=", 1)
+        latencies, elapsed, failures = await run_target(base_url, args.sessions)
+
+        print(f"\n{label} ({base_url}): {args.sessions} interviews in {elapsed:.1f}s, "
+              f"{args.sessions / elapsed:.2f} interviews/s, {failures} failed")
+        for step in STEPS:
+            if latencies[step]:
+                print(
+                    f"  {step:<9} n={len(latencies[step]):<5} "
+                    f"p50={statistics.median(latencies[step]) * 1000:8.1f}ms "
+                    f"p95={percentile(latencies[step], 0.95) * 1000:8.1f}ms"
+                )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,102 @@
+"""
+Latency of a cheap authenticated endpoint before and during a login storm.
+
+Needs a running server. Run from backend/:
+    python -m benchmarks.bench_login_storm --base-url http://127.0.0.1:8000 --logins 200
+
+--probe-path should point at something that does no LLM work, e.g. /auth/me
+or /interview/feedback?session_id=<completed session> (served from the DB).
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+EMAIL = "bench-login-storm@example.com"
+PASSWORD = "bench-password"
+
+
+def summarize(label, latencies):
+    if not latencies:
+        print(f"{label:<16} no samples")
+        return
+
+    ordered = sorted(latencies)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    print(
+        f"{label:<16} n={len(ordered):<5} "
+        f"p50={statistics.median(ordered) * 1000:7.1f}ms "
+        f"p95={p95 * 1000:7.1f}ms "
+        f"max={ordered[-1] * 1000:7.1f}ms"
+    )
+
+
+async def login(client):
+    return await client.post(
+        "/auth/login",
+        data={"username": EMAIL, "password": PASSWORD}
+    )
+
+
+async def probe(client, method, path, headers, stop, latencies):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.request(method, path, headers=headers)
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(0.01)
+
+
+async def storm(client, count, concurrency, statuses):
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with gate:
+            response = await login(client)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    await asyncio.gather(*(one() for _ in range(count)))
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--probe-method", default="GET")
+    parser.add_argument("--probe-path", default="/auth/me")
+    parser.add_argument("--baseline-seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    limits = httpx.Limits(max_connections=args.concurrency + 10)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60) as client:
+        await client.post("/auth/signup", json={"email": EMAIL, "password": PASSWORD})
+        token = (await login(client)).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        baseline = []
+        stop = asyncio.Event()
+        task = asyncio.create_task(probe(client, args.probe_method, args.probe_path, headers, stop, baseline))
+        await asyncio.sleep(args.baseline_seconds)
+        stop.set()
+        await task
+
+        during = []
+        statuses = {}
+        stop = asyncio.Event()
+        task = asyncio.create_task(probe(client, args.probe_method, args.probe_path, headers, stop, during))
+        start = time.perf_counter()
+        await storm(client, args.logins, args.concurrency, statuses)
+        storm_time = time.perf_counter() - start
+        stop.set()
+        await task
+
+    print(f"probe: {args.probe_method} {args.probe_path}")
+    summarize("baseline", baseline)
+    summarize("during storm", during)
+    print(f"storm: {args.logins} logins in {storm_time:.2f}s, status counts {statuses}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,34 @@
+"""
+Per-call overhead of the metrics hooks (stage_timer, timed_stage).
+
+Pure Python, no server needed. Run from backend/:
+    python -m benchmarks.bench_metrics_overhead --calls 200000
+"""
+import argparse
+import timeit
+
+from app.utils.metrics import stage_timer, timed_stage
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=200000)
+    args = parser.parse_args()
+
+    def bare():
+        pass
+
+    def with_timer():
+        with stage_timer("bench"):
+            pass
+
+    decorated = timed_stage("bench")(bare)
+
+    baseline = min(timeit.repeat(bare, number=args.calls, repeat=5))
+    for label, fn in (("stage_timer", with_timer), ("timed_stage", decorated)):
+        elapsed = min(timeit.repeat(fn, number=args.calls, repeat=5))
+        print(f"{label:<12} {(elapsed - baseline) / args.calls * 1e6:.2f} us/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Character vs token-aware chunking: chunks per resume, tokens embedded vs
+silently truncated by the model, and chunk+embed time.
+
+Run from backend/:
+    python -m benchmarks.bench_token_chunker --pages 1 3 10
+"""
+import argparse
+import random
+import time
+
+from app.utils.embedding import embed_texts, get_tokenizer, max_chunk_tokens
+from app.utils.ingestion import iter_resume_chunks
+from app.utils.text_cleaner import iter_clean_pages
+from benchmarks.synthetic import synthetic_resume_page
+
+
+def token_counts(chunks, tokenizer):
+    return [
+        len(ids)
+        for ids in tokenizer(chunks, add_special_tokens=False, verbose=False)["input_ids"]
+    ]
+
+
+def run(strategy, pages, tokenizer, window):
+    start = time.perf_counter()
+    chunks = list(iter_resume_chunks(iter_clean_pages(pages), strategy))
+    chunk_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    embed_texts(chunks)
+    embed_time = time.perf_counter() - start
+
+    counts = token_counts(chunks, tokenizer)
+    embedded = sum(min(c, window) for c in counts)
+    discarded = sum(max(c - window, 0) for c in counts)
+
+    return len(chunks), embedded, discarded, chunk_time, embed_time
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 3, 10])
+    args = parser.parse_args()
+
+    tokenizer = get_tokenizer()
+    window = max_chunk_tokens()
+
+    # Warm up tokenizer and model
+    embed_texts(["warm up"])
+
+    print(f"model window: {window} tokens")
+    print(f"{'pages':>5} {'strategy':<8} {'chunks':>7} {'embedded':>9} {'discarded':>10} {'chunk ms':>9} {'embed ms':>9}")
+
+    for page_count in args.pages:
+        rng = random.Random(0)
+        pages = [synthetic_resume_page(rng, p) + "\n" for p in range(1, page_count + 1)]
+
+        for strategy in ("chars", "tokens"):
+            chunks, embedded, discarded, chunk_time, embed_time = run(strategy, pages, tokenizer, window)
+            print(
+                f"{page_count:>5} {strategy:<8} {chunks:>7} {embedded:>9} {discarded:>10} "
+                f"{chunk_time * 1000:>9.1f} {embed_time * 1000:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Stand-in for the Groq chat completions API with a fixed response delay, so
+load tests measure the server and not the model. The reply is JSON so the
+answer-evaluation and feedback parsers accept it too.
+
+Run from backend/, then start the server under test with
+GROQ_BASE_URL=http://127.0.0.1:9000 GROQ_API_KEY=fake:
+    FAKE_GROQ_LATENCY_MS=800 uvicorn benchmarks.fake_groq:app --port 9000
+"""
+import asyncio
+import json
+import os
+import time
+
+from fastapi import FastAPI
+
+FAKE_GROQ_LATENCY_MS = float(os.getenv("FAKE_GROQ_LATENCY_MS", "800"))
+
+REPLY = json.dumps({
+    "score": 7,
+    "question": "Describe a system you designed and the trade-offs you made.",
+    "strengths": ["Clear structure"],
+    "weaknesses": ["Few concrete numbers"],
+    "suggestions": ["Quantify impact"],
+    "summary": "Solid answers overall."
+})
+
+app = FastAPI()
+
+
+@app.post("/openai/v1/chat/completions")
+async def chat_completions(body: dict):
+    await asyncio.sleep(FAKE_GROQ_LATENCY_MS / 1000)
+
+    return {
+        "id": "fake",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "fake"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": REPLY},
+            "finish_reason": "stop"
+        }],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+    }
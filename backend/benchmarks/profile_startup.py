@@ -0,0 +1,69 @@
+"""
+Worker boot profile: import time of app.main (via -X importtime), RSS after
+import, and how long the embedding warmup takes afterwards.
+
+Run from backend/ (DATABASE_URL etc. must be set, as for the app):
+    python -m benchmarks.profile_startup --top 15
+
+To compare with the old eager startup, run it on an earlier commit.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+CHILD = """
+import json, resource, time
+start = time.perf_counter()
+import app.main
+imported = time.perf_counter() - start
+rss_import = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+start = time.perf_counter()
+from app.utils import embedding
+embedding.warmup()
+warm = time.perf_counter() - start
+rss_warm = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+print(json.dumps({"import_s": imported, "rss_import_mb": rss_import, "warmup_s": warm, "rss_warm_mb": rss_warm}))
+"""
+
+
+def parse_importtime(stderr: str):
+    # Lines look like: "import time:   self [us] | cumulative | imported package"
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, self_us, cumulative_us, name = [part.strip() for part in line.replace("import time:", "|", 1).split("|")]
+        rows.append((name, int(self_us), int(cumulative_us)))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    env = dict(os.environ, EMBEDDING_WARMUP="lazy")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD],
+        capture_output=True,
+        text=True,
+        env=env
+    )
+
+    if result.returncode != 0:
+        print(result.stderr[-2000:])
+        sys.exit(result.returncode)
+
+    rows = parse_importtime(result.stderr)
+    top_level = [r for r in rows if not r[0].startswith(" ")]
+    summary = result.stdout.strip().splitlines()[-1]
+
+    print(f"summary: {summary}")
+    print(f"\nslowest top-level imports (cumulative ms) under import app.main:")
+    for name, _, cumulative in sorted(top_level, key=lambda r: r[2], reverse=True)[:args.top]:
+        print(f"{cumulative / 1000:9.1f}  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import random
+
+SKILLS = [
+    "Python", "Go", "Kubernetes", "Docker", "PostgreSQL", "React", "TypeScript",
+    "AWS", "Terraform", "Kafka", "Redis", "FastAPI", "Django", "Spark", "Airflow",
+]
+
+VERBS = [
+    "Designed", "Built", "Led", "Migrated", "Optimized", "Automated",
+    "Maintained", "Shipped", "Refactored", "Scaled",
+]
+
+OBJECTS = [
+    "a payments service", "the data pipeline", "an internal CLI", "CI/CD workflows",
+    "a recommendation engine", "the customer dashboard", "monitoring and alerting",
+    "a multi-tenant API", "the search backend", "batch ETL jobs",
+]
+
+# Roughly one PDF page of resume text
+LINES_PER_PAGE = 45
+
+
+def synthetic_resume_page(rng: random.Random, page_number: int) -> str:
+    lines = [f"Experience (continued) Page {page_number}"]
+
+    for _ in range(LINES_PER_PAGE):
+        skills = ", ".join(rng.sample(SKILLS, 3))
+        lines.append(
+            f"• {rng.choice(VERBS)} {rng.choice(OBJECTS)} using {skills}, "
+            f"improving throughput by {rng.randint(5, 80)}% for {rng.randint(2, 40)} teams."
+        )
+
+    return "\n".join(lines)
+
+
+def synthetic_resume_text(pages: int = 10, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    return "\n\n".join(
+        synthetic_resume_page(rng, page) for page in range(1, pages + 1)
+    )
+
+
+def synthetic_resume_pdf(pages: int = 10, seed: int = 0) -> bytes:
+    import fitz  # PyMuPDF
+
+    rng = random.Random(seed)
+    pdf = fitz.open()
+
+    for page_number in range(1, pages + 1):
+        page = pdf.new_page()
+        page.insert_textbox(
+            page.rect + (36, 36, -36, -36),
+            synthetic_resume_page(rng, page_number),
+            fontsize=7
+        )
+
+    data = pdf.tobytes()
+    pdf.close()
+    return data
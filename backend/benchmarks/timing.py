@@ -0,0 +1,17 @@
+import time
+
+
+def best_of(fn, repeats: int):
+    """
+    Calls fn `repeats` times. Returns (result of the last call, fastest
+    call in seconds).
+    """
+
+    best = None
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
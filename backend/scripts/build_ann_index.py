@@ -0,0 +1,124 @@
+"""
+(Re)trains the cross-resume ANN index from every stored ResumeChunk embedding.
+
+Uploads keep the index current incrementally; rerun this when the corpus has
+grown well past the size it was last trained on (or to create it for an
+existing database). Writes a new generation and swaps it in atomically, so
+running workers keep serving the old one until they see the new manifest.
+
+Run from backend/:
+    python -m scripts.build_ann_index [--nlist N] [--sample 100000] [--batch-size 5000]
+"""
+import argparse
+import math
+import time
+
+import numpy as np
+
+from app.database import SessionLocal
+from app.models.resume import Resume
+from app.models.resume_chunk import ResumeChunk
+from app.utils.ann_index import AnnIndex, train_centroids
+from app.utils.embedding_codec import decode_embedding_matrix
+
+
+def iter_batches(db, batch_size: int, after_id: int = 0):
+    last_id = after_id
+
+    while True:
+        rows = (
+            db.query(
+                ResumeChunk.id,
+                ResumeChunk.resume_id,
+                Resume.user_id,
+                ResumeChunk.embedding,
+                ResumeChunk.embedding_vector,
+                ResumeChunk.embedding_dtype,
+                ResumeChunk.embedding_scale
+            )
+            .join(Resume, Resume.id == ResumeChunk.resume_id)
+            .filter(ResumeChunk.id > last_id)
+            .order_by(ResumeChunk.id)
+            .limit(batch_size)
+            .all()
+        )
+
+        if not rows:
+            return
+
+        last_id = rows[-1].id
+        yield rows, decode_embedding_matrix(rows)
+
+
+def sample_vectors(db, batch_size: int, sample_size: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    total = db.query(ResumeChunk.id).count()
+    keep = min(1.0, sample_size / max(total, 1))
+
+    sample = []
+    for _, matrix in iter_batches(db, batch_size):
+        sample.append(matrix[rng.random(len(matrix)) < keep])
+
+    return total, np.vstack(sample) if sample else np.empty((0, 0), dtype=np.float32)
+
+
+def append_batch(index, generation, centroids, rows, matrix):
+    index.append(
+        generation,
+        centroids,
+        [r.id for r in rows],
+        [r.resume_id for r in rows],
+        [r.user_id for r in rows],
+        matrix
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--nlist", type=int, default=0, help="Lists to train; default 4 * sqrt(chunks)")
+    parser.add_argument("--sample", type=int, default=100000, help="Vectors used for k-means")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    index = AnnIndex()
+    index.refresh()
+    generation = 0 if index.generation is None else index.generation + 1
+
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        total, sample = sample_vectors(db, args.batch_size, args.sample)
+        if total == 0:
+            print("No chunks to index")
+            return
+
+        nlist = args.nlist or max(1, int(4 * math.sqrt(total)))
+        centroids = train_centroids(sample, nlist)
+        print(f"Trained {len(centroids)} lists on {len(sample)} vectors in {time.perf_counter() - start:.1f}s")
+
+        index.write_generation(generation, centroids)
+
+        last_id = 0
+        for rows, matrix in iter_batches(db, args.batch_size):
+            append_batch(index, generation, centroids, rows, matrix)
+            last_id = rows[-1].id
+
+        # Catch up on uploads that landed meanwhile, then switch over while
+        # holding the lock so no upload appends to the old generation after it
+        with index.file_lock():
+            for rows, matrix in iter_batches(db, args.batch_size, after_id=last_id):
+                append_batch(index, generation, centroids, rows, matrix)
+            index.publish(generation, centroids.shape[1], len(centroids))
+    finally:
+        db.close()
+
+    # Workers that still map the old files keep them alive until they reload
+    if generation > 0:
+        index.remove_generation(generation - 1)
+
+    index.refresh()
+    print(f"Published generation {generation}: {index.count} chunks in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
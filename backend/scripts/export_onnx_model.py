@@ -0,0 +1,58 @@
+"""
+Exports the sentence-transformers model to a local directory usable by
+EMBEDDING_BACKEND=onnx (and by EMBEDDING_BACKEND=torch via EMBEDDING_MODEL_DIR).
+
+Run from backend/:
+    python -m scripts.export_onnx_model --output models/all-MiniLM-L6-v2 [--quantize]
+"""
+import argparse
+import os
+
+import torch
+from sentence_transformers import SentenceTransformer
+
+from app.utils.embedding_backends import DEFAULT_MODEL_NAME, ONNX_MODEL_FILE, OnnxBackend
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default=DEFAULT_MODEL_NAME)
+    parser.add_argument("--output", required=True)
+    parser.add_argument("--opset", type=int, default=14)
+    parser.add_argument("--quantize", action="store_true", help="Also write the int8 dynamically quantized graph")
+    args = parser.parse_args()
+
+    os.makedirs(args.output, exist_ok=True)
+
+    # Full sentence-transformers layout (tokenizer, sentence_bert_config.json),
+    # so the torch backend can load the same directory
+    model = SentenceTransformer(args.model, device="cpu")
+    model.save(args.output)
+
+    transformer = model[0].auto_model.eval()
+    tokenizer = model.tokenizer
+    dummy = tokenizer(["Exporting the resume embedding model"], return_tensors="pt")
+
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in dummy]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    with torch.no_grad():
+        torch.onnx.export(
+            transformer,
+            tuple(dummy[name] for name in input_names),
+            os.path.join(args.output, ONNX_MODEL_FILE),
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=args.opset
+        )
+
+    if args.quantize:
+        OnnxBackend._quantized(args.output)
+
+    print(f"Exported {args.model} to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
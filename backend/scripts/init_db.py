@@ -0,0 +1,13 @@
+"""
+Creates any missing tables and applies pending migrations (app/migrations.py).
+Run once per deploy, not on every worker boot.
+
+Run from backend/:
+    python -m scripts.init_db
+"""
+from app.database import init_db
+
+
+if __name__ == "__main__":
+    init_db()
+    print("Schema up to date")
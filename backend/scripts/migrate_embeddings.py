@@ -0,0 +1,99 @@
+"""
+Converts legacy JSON ResumeChunk embeddings to the binary embedding_vector column.
+
+Run from backend/:
+    python -m scripts.migrate_embeddings [--dtype float32|float16|int8] [--batch-size 500] [--keep-json]
+"""
+import argparse
+
+from sqlalchemy import null
+
+from app.database import SessionLocal, init_db
+from app.models.resume_chunk import ResumeChunk
+from app.utils.embedding_codec import encode_embedding, EMBEDDING_STORAGE_DTYPE
+
+
+def convert_rows(dtype: str, batch_size: int, keep_json: bool) -> int:
+    db = SessionLocal()
+    converted = 0
+    last_id = 0
+
+    try:
+        while True:
+            rows = (
+                db.query(ResumeChunk.id, ResumeChunk.embedding)
+                .filter(
+                    ResumeChunk.embedding_vector.is_(None),
+                    ResumeChunk.embedding.isnot(None),
+                    ResumeChunk.id > last_id
+                )
+                .order_by(ResumeChunk.id)
+                .limit(batch_size)
+                .all()
+            )
+
+            if not rows:
+                break
+
+            updates = []
+            for chunk_id, embedding in rows:
+                blob, scale = encode_embedding(embedding, dtype)
+                update = {
+                    "id": chunk_id,
+                    "embedding_vector": blob,
+                    "embedding_dtype": dtype,
+                    "embedding_scale": scale
+                }
+                if not keep_json:
+                    update["embedding"] = None
+                updates.append(update)
+
+            db.bulk_update_mappings(ResumeChunk, updates)
+            db.commit()
+
+            converted += len(rows)
+            last_id = rows[-1].id
+            print(f"Converted {converted} chunks")
+    finally:
+        db.close()
+
+    return converted
+
+
+def clear_converted_json() -> int:
+    """
+    Sets the legacy column to SQL NULL on converted rows, including rows an
+    earlier run "cleared" to the JSON literal 'null'.
+    """
+
+    db = SessionLocal()
+    try:
+        cleared = db.query(ResumeChunk).filter(
+            ResumeChunk.embedding_vector.isnot(None),
+            ResumeChunk.embedding.isnot(None)
+        ).update({ResumeChunk.embedding: null()}, synchronize_session=False)
+        db.commit()
+        return cleared
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dtype", default=EMBEDDING_STORAGE_DTYPE, choices=["float32", "float16", "int8"])
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--keep-json", action="store_true", help="Do not clear the legacy JSON column")
+    args = parser.parse_args()
+
+    # Adds the binary columns (migration 1) if this database predates them
+    init_db()
+    total = convert_rows(args.dtype, args.batch_size, args.keep_json)
+
+    if not args.keep_json:
+        print(f"Cleared legacy JSON on {clear_converted_json()} converted chunks")
+
+    print(f"Done: {total} chunks stored as {args.dtype}")
+
+
+if __name__ == "__main__":
+    main()